@@ -1,4 +1,5 @@
-from dataclasses import asdict, dataclass, field
+import copy
+from dataclasses import dataclass, field, fields
 from typing import Any
 
 from dandori.core.status import Status, get_initial_status
@@ -6,7 +7,7 @@ from dandori.util.ids import gen_task_id
 from dandori.util.time import now_iso
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     id: str
     owner: str
@@ -30,7 +31,24 @@ class Task:
     metadata: dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> dict[str, Any]:
-        return asdict(self)
+        """dataclasses.asdict と同じ dict を返す。
+
+        asdict は全フィールドを汎用的に再帰コピーするため遅い。
+        リスト型のフィールドは浅いコピー、metadata だけは入れ子になりうるので deepcopy する。
+        """
+        d = {name: getattr(self, name) for name in _TASK_FIELDS}
+        for name in _TASK_LIST_FIELDS:
+            d[name] = list(d[name])
+        d["metadata"] = copy.deepcopy(self.metadata) if self.metadata else {}
+        return d
+
+    def __copy__(self) -> "Task":
+        # リストや metadata は元のタスクと共有する
+        return Task(**{name: getattr(self, name) for name in _TASK_FIELDS})
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> "Task":
+        # copy.deepcopy の汎用処理を通さず、to_dict() のコピーから作り直す
+        return Task(**self.to_dict())
 
     @staticmethod
     def from_dict(d: dict[str, Any]) -> "Task":
@@ -42,3 +60,7 @@ class Task:
             d["owner"] = d.get("owner") or "system"
             d["title"] = d.get("title") or "temporary title (lack of required fields)"
             return Task(**d)
+
+
+_TASK_FIELDS: tuple[str, ...] = tuple(f.name for f in fields(Task))
+_TASK_LIST_FIELDS: tuple[str, ...] = ("depends_on", "children", "tags")
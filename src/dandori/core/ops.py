@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Required, TypedDict
 
 from pyresults import Err, Ok, Result
 
@@ -31,6 +31,20 @@ class OpsError(Exception):
     """ops 層でのユースケース実行失敗を表す例外。"""
 
 
+class TaskSpec(TypedDict, total=False):
+    """add_tasks に渡す 1 タスク分の指定。キーは add_task の引数と同じ ("title" のみ必須)。"""
+
+    parent_ids: list[str]
+    title: Required[str]
+    overwrite_id_by: str | None
+    description: str
+    priority: int | None
+    start: datetime | None
+    due: datetime | None
+    tags: list[str] | None
+    metadata: str | None
+
+
 # ---- 内部ユーティリティ ----------------------------------------------------
 
 
@@ -181,10 +195,11 @@ def list_tasks(  # noqa: C901
         all_tasks = [t for t in all_tasks if query_tags_norm <= set(_normalize_tags(t.tags))]
 
     # ソート
-    if topo:  # noqa: SIM108
+    if topo:
         tasks = topo_sort({t.id: t for t in all_tasks})
     else:
-        tasks = sorted(all_tasks, key=lambda t: task_sort_key(t))
+        now = now_iso()
+        tasks = sorted(all_tasks, key=lambda t: task_sort_key(t, now=now))
 
     return tasks
 
@@ -236,6 +251,41 @@ def get_task(task_id: str) -> Task:
 # ---- 追加 / 更新 -----------------------------------------------------------
 
 
+def _build_task(owner: str, spec: TaskSpec) -> Task:
+    """add_task / add_tasks の引数から新規 Task を組み立てる (spec の "parent_ids" はここでは使わない)。"""
+    start = spec.get("start")
+    due = spec.get("due")
+    return Task(
+        id=spec.get("overwrite_id_by") or gen_task_id(owner),
+        owner=owner,
+        title=spec["title"],
+        description=spec.get("description") or "",
+        priority=spec.get("priority") or 0,
+        start_at=start.strftime("%Y-%m-%dT%H:%M:%S") if start else None,
+        due_date=due.strftime("%Y-%m-%dT%H:%M:%S") if due else None,
+        tags=spec.get("tags") or [],
+        metadata=serialize(spec.get("metadata") or "").unwrap_or({}),
+    )
+
+
+def _add_with_parents(st: Store, t: Task, parent_ids: list[str]) -> None:
+    """タスクを追加して親とリンクする。失敗時はロールバックして OpsError を送出する。"""
+    # 追加
+    res = st.add_task(t)
+    if res.is_err():
+        st.rollback()
+        raise OpsError(res.unwrap_err())
+
+    # 親子リンク
+    for parent_id in parent_ids:
+        link_res = st.link_tasks(parent_id, t.id)
+        if link_res.is_err():
+            st.rollback()
+            raise OpsError(link_res.unwrap_err())
+
+    t.updated_at = now_iso()
+
+
 def add_task(
     parent_ids: list[str],
     title: str,
@@ -260,36 +310,49 @@ def add_task(
     st.load()
     st.commit()
 
-    tid = overwrite_id_by or gen_task_id(username)
-    t = Task(
-        id=tid,
-        owner=env.get("USERNAME", "anonymous"),
-        title=title,
-        description=description or "",
-        priority=priority or 0,
-        start_at=start.strftime("%Y-%m-%dT%H:%M:%S") if start else None,
-        due_date=due.strftime("%Y-%m-%dT%H:%M:%S") if due else None,
-        tags=tags or [],
-        metadata=serialize(metadata or "").unwrap_or({}),
+    t = _build_task(
+        username,
+        TaskSpec(
+            title=title,
+            overwrite_id_by=overwrite_id_by,
+            description=description,
+            priority=priority,
+            start=start,
+            due=due,
+            tags=tags,
+            metadata=metadata,
+        ),
     )
+    _add_with_parents(st, t, parent_ids)
 
-    # 追加
-    res = st.add_task(t)
-    if res.is_err():
-        st.rollback()
-        raise OpsError(res.unwrap_err())
+    st.commit()
+    st.save()
+    return t
 
-    # 親子リンク
-    for parent_id in parent_ids:
-        link_res = st.link_tasks(parent_id, t.id)
-        if link_res.is_err():
-            st.rollback()
-            raise OpsError(link_res.unwrap_err())
 
-    t.updated_at = now_iso()
+def add_tasks(specs: list[TaskSpec]) -> list[Task]:
+    """複数のタスクをまとめて追加するユースケース。
+
+    各 spec は add_task の引数を表す TaskSpec（"title" は必須、"parent_ids" は省略時 []）。
+    ストアの読み込みと保存は全体で 1 回だけ行う。先に追加したタスクを後続の親に指定できる。
+    途中で失敗した場合はすべてロールバックし、OpsError を送出する。
+    """
+    env = load_env()
+    username = env.get("USERNAME", "anonymous")
+
+    st = get_store()
+    st.load()
+    st.commit()
+
+    added: list[Task] = []
+    for spec in specs:
+        t = _build_task(username, spec)
+        _add_with_parents(st, t, spec.get("parent_ids", []))
+        added.append(t)
+
     st.commit()
     st.save()
-    return t
+    return added
 
 
 def update_task(  # noqa: C901
@@ -521,6 +584,32 @@ def archive_tree(task_id: str) -> list[str]:
             raise OpsError(_msg)
 
 
+def archive_trees(task_ids: list[str]) -> list[str]:
+    """複数の起点について、弱連結成分単位でまとめてアーカイブするユースケース。
+
+    ストアの読み込み・保存は1回だけ行う。既に処理した成分に含まれる起点はスキップする。
+    いずれかの起点でエラーになった場合は、すべての変更を取り消して OpsError を送出する。
+
+    戻り値は、アーカイブ状態が変更されたタスクIDのリスト (重複なし)。
+    """
+    st = get_store()
+    st.load()
+    st.commit()
+
+    archived: dict[str, None] = {}
+    for task_id in task_ids:
+        if task_id in archived:
+            continue
+        _res = st.archive_tasks(task_id)
+        if _res.is_err():
+            st.rollback()
+            raise OpsError(_res.unwrap_err())
+        archived.update(dict.fromkeys(_res.unwrap()))
+    st.commit()
+    st.save()
+    return list(archived)
+
+
 def unarchive_tree(task_id: str) -> list[str]:
     """弱連結成分単位でアーカイブ解除するユースケース。"""
     st = get_store()
@@ -9,11 +9,13 @@ def task_sort_key(
     t: Task,
     *,
     order_with_no_start: Literal["now", "end_of_time"] = "now",
+    now: str | None = None,
 ) -> tuple[int, str, str, str]:
     # priority 降順 → start_date(or now扱い) → created_at → id
     # startが無いものはnow扱いか、後置きしたい場合は調整(9999-12-31T23:59:59)にする
+    # 1回のソート中は同じ now を使えるよう、呼び出し側で計算済みの now を渡せる
     if order_with_no_start == "now":
-        start = t.start_at or now_iso()
+        start = t.start_at or now or now_iso()
     elif order_with_no_start == "end_of_time":
         start = "9999-12-31T23:59:59"
     return (-(t.priority or 0), start, t.created_at, t.id)
@@ -26,38 +28,42 @@ def topo_sort(tasks: dict[str, Task]) -> list[Task]:
     これにより、status / archived / requested_only などでフィルタした
     部分集合に対しても安全に利用できる。
     """
-    # 全nodeのindegreeを0で初期化
-    indeg: dict[str, int] = dict.fromkeys(tasks.keys(), 0)
+    # id ではなく整数インデックスで扱い、辞書引きをループの外に出す
+    nodes = list(tasks.values())
+    index = {tid: i for i, tid in enumerate(tasks)}
+    n = len(nodes)
 
-    # tasksに含まれるnodeのedgeのみを数える
-    for t in tasks.values():
-        for child_id in t.children:
-            if child_id in tasks:
-                indeg[child_id] += 1
+    # tasksに含まれるnodeへのedgeのみを子のインデックス列として持つ
+    adj = [[index[child_id] for child_id in t.children if child_id in index] for t in nodes]
+
+    # indegreeを数える
+    indeg = [0] * n
+    for children in adj:
+        for c in children:
+            indeg[c] += 1
 
     # indegreeが0のnodeをtask_sort_keyでソートしてキューに積む
-    zero_ids = [tid for tid, d in indeg.items() if d == 0]
-    zero_ids.sort(key=lambda tid: task_sort_key(tasks[tid]))
-    q: deque[str] = deque[str](zero_ids)
+    now = now_iso()
+    zero = [i for i in range(n) if indeg[i] == 0]
+    zero.sort(key=lambda i: task_sort_key(nodes[i], now=now))
+    q: deque[int] = deque[int](zero)
     result: list[Task] = []
+    done = [False] * n
 
     while q:
         u = q.popleft()
-        result.append(tasks[u])
+        result.append(nodes[u])
+        done[u] = True
 
-        # childが部分グラフ外の場合はスキップする
-        for child_id in tasks[u].children:
-            if child_id not in indeg:
-                continue
-            indeg[child_id] -= 1
-            if indeg[child_id] == 0:
-                q.append(child_id)
+        for c in adj[u]:
+            indeg[c] -= 1
+            if indeg[c] == 0:
+                q.append(c)
 
     # (念の為) 残ったnodeがあったら後方に足す
-    if len(result) < len(tasks):
-        in_result = {t.id for t in result}
-        remains = [t for tid, t in tasks.items() if tid not in in_result]
-        remains.sort(key=lambda t: task_sort_key(t))
+    if len(result) < n:
+        remains = [nodes[i] for i in range(n) if not done[i]]
+        remains.sort(key=lambda t: task_sort_key(t, now=now))
         result.extend(remains)
 
     return result
@@ -1,9 +1,11 @@
 # ruff: noqa: C901, T201
 
 import argparse
+import logging
 import os
 import sys
 from datetime import datetime
+from typing import TYPE_CHECKING
 
 from dandori import __version__
 from dandori.core.ops import (
@@ -31,9 +33,12 @@ from dandori.storage import get_store
 from dandori.util.dirs import load_env
 from dandori.util.ids import parse_id_with_msg
 from dandori.util.logger import setup_logger, setup_mode
-from dandori.util.time import format_requested_sla
+from dandori.util.time import JST, format_requested_sla
 
-logger = setup_logger("dandori", is_stream=True, is_file=True)
+if TYPE_CHECKING:
+    from dandori.core.models import Task
+
+logger = logging.getLogger("dandori")
 
 
 def _parse_datetime(s: str | None) -> datetime | None:
@@ -98,6 +103,7 @@ def cmd_list(args: argparse.Namespace) -> int:
             q = args.query.lower()
             tasks = [t for t in tasks if q in t.title.lower() or q in (t.description or "").lower()]
 
+        now = datetime.now(JST)
         for t in tasks:
             _id = t.id[:LENGTH_SHORTEND_ID].ljust(LENGTH_SHORTEND_ID)
             if args.details:
@@ -106,7 +112,7 @@ def cmd_list(args: argparse.Namespace) -> int:
                 continue
             tag = f"[{status_mark(t.status, archived=t.is_archived)}]"
             assigned = f" -> {t.assigned_to}" if t.assigned_to else ""
-            sla = format_requested_sla(t)
+            sla = format_requested_sla(t, now=now)
             extra = f" ({sla.unwrap()})" if sla.is_ok() else f" ({sla.unwrap_err()})"
             print(f"{tag} {_id} | p={t.priority} | {t.status}{assigned}{extra} | {t.title}")
 
@@ -121,7 +127,7 @@ def cmd_list(args: argparse.Namespace) -> int:
 def cmd_show(args: argparse.Namespace) -> int:
     try:
         if args.id is None:
-            logger.exception("id is required")
+            logger.error("id is required")
             return 1
         t = get_task(
             parse_id_with_msg(
@@ -278,7 +284,7 @@ def cmd_insert(args: argparse.Namespace) -> int:
     try:
         tasks = list_tasks()
         if args.a is None or args.b is None or args.id is None:
-            logger.exception("a, b, and id are required")
+            logger.error("a, b, and id are required")
             return 1
         a_id = parse_id_with_msg(
             args.a,
@@ -377,7 +383,7 @@ def cmd_reason(args: argparse.Namespace) -> int:
     _info = st.get_dependency_info(args_id)
     if _info.is_err():
         _msg = f"An error occurred while getting dependency info: {_info.unwrap_err()}"
-        logger.exception(_msg)
+        logger.error(_msg)
         return 1
     info = _info.unwrap()
     for k, v in info.items():
@@ -416,7 +422,7 @@ def cmd_export(args: argparse.Namespace) -> int:
     _tasks = st.get_all_tasks()
     if _tasks.is_err():
         _msg = f"An error occurred while exporting tasks: {_tasks.unwrap_err()}"
-        logger.exception(_msg)
+        logger.error(_msg)
         return 1
     tasks = _tasks.unwrap()
     export_json(tasks, args.path)
@@ -435,16 +441,19 @@ def cmd_import(args: argparse.Namespace) -> int:
         return 1
     tasks = _tasks.unwrap()
     incoming = import_json(args.path)
+    new_tasks: list[Task] = []
     for tid, t in incoming.items():
         if tid in tasks:
             # 衝突ポリシー: ID重複は上書きせずスキップ (ログ表示)
             print(f"skip (exists): {tid}")
             continue
-        _res = st.add_task(t, id_overwritten=tid)
-        if _res.is_err():
-            st.rollback()
-            print(f"Error: {_res.unwrap_err()}")
-            return 1
+        t.id = tid
+        new_tasks.append(t)
+    _res = st.add_tasks(new_tasks)
+    if _res.is_err():
+        st.rollback()
+        print(f"Error: {_res.unwrap_err()}")
+        return 1
     st.commit()
     st.save()
     print(f"imported from {args.path}")
@@ -697,6 +706,7 @@ def main(argv: list[str] | None = None) -> int:
     argv = argv if argv is not None else sys.argv[1:]
     parser = build_parser()
     args = parser.parse_args(argv)
+    setup_logger("dandori", is_stream=True, is_file=True)
     # Apply global options before subcommand (root func is never used when subcommand exists)
     if getattr(args, "debug", False):
         setup_mode(is_debug=True)
@@ -1,6 +1,7 @@
 import argparse
 import curses
 import locale
+import logging
 import time
 from collections.abc import Callable
 from datetime import datetime
@@ -26,9 +27,8 @@ from dandori.interfaces.tui.style import HeaderLines
 from dandori.interfaces.tui.view import AppView
 from dandori.util.dirs import load_env
 from dandori.util.ids import parse_ids_with_msg
-from dandori.util.logger import setup_logger
 
-logger = setup_logger("dandori", is_stream=True, is_file=True)
+logger = logging.getLogger("dandori")
 
 locale.setlocale(locale.LC_ALL, "")
 
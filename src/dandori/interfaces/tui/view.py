@@ -1,5 +1,6 @@
 import curses
 import locale
+import logging
 from dataclasses import dataclass
 
 from dandori.core.models import Task
@@ -21,9 +22,8 @@ from dandori.interfaces.tui.style import (
     WORKING_COLOR,
     HeaderLines,
 )
-from dandori.util.logger import setup_logger
 
-logger = setup_logger("dandori", is_stream=True, is_file=True)
+logger = logging.getLogger("dandori")
 
 locale.setlocale(locale.LC_ALL, "")
 
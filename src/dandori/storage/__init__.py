@@ -1,4 +1,5 @@
 from dandori.storage.base import Store
+from dandori.storage.json_store import StoreToJSON
 from dandori.storage.sqlite3_store import StoreToSQLite
 from dandori.storage.yaml_store import StoreToYAML
 from dandori.util.dirs import load_env
@@ -17,5 +18,7 @@ def get_store() -> Store:
         return StoreToYAML()
     if data_path.endswith(".db"):  # and archive_path.endswith(".db"):
         return StoreToSQLite()
+    if data_path.endswith(".json"):
+        return StoreToJSON()
     _msg = f"Invalid data path or archive path: {data_path} or {archive_path}"
     raise ValueError(_msg)
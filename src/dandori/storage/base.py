@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 
-from pyresults import Result
+from pyresults import Ok, Result
 
 from dandori.core.models import Task
 from dandori.util.dirs import load_env
@@ -16,6 +16,7 @@ class Store(ABC):
         - load(): ストレージからデータを読み込む
         - save(): ストレージにデータを保存する
         - add_task(): タスクを追加する
+        - add_tasks(): 複数のタスクをまとめて追加する
         - get(): タスクIDでタスクを取得する
         - get_all_tasks(): 全タスクを取得する
         - remove(): タスクを削除する
@@ -119,6 +120,25 @@ class Store(ABC):
         """
         raise NotImplementedError
 
+    def add_tasks(self, tasks: list[Task]) -> Result[None, str]:
+        """複数のタスクをまとめて追加する。
+
+        既定の実装は add_task() を順に呼び、最初に失敗した時点でその Err を返す。
+        それまでに追加した分を取り消すには rollback() を呼ぶ。
+
+        Args:
+            tasks: 追加するタスクのリスト (親子関係は各タスクの depends_on / children で渡す)
+
+        Returns:
+            Ok(None): 成功時
+            Err(str): 失敗時（例: 既に存在するID）
+        """
+        for task in tasks:
+            res = self.add_task(task)
+            if res.is_err():
+                return res
+        return Ok[None, str](None)
+
     @abstractmethod
     def update_task(self, task: Task) -> Result[None, str]:
         """タスクを更新する。
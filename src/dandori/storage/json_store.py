@@ -0,0 +1,59 @@
+import json
+from typing import Any, TextIO
+
+from dandori.core.models import Task
+from dandori.storage.yaml_store import StoreToYAML
+
+
+def _std_loads(s: str) -> Any:  # noqa: ANN401
+    return json.loads(s)
+
+
+def _std_dumps(d: dict[str, Any]) -> str:
+    return json.dumps(d, ensure_ascii=False, separators=(",", ":"))
+
+
+# orjson がインストールされていれば使う (extras "fast")。出力は標準 json の compact 形式と同じ。
+# orjson.JSONDecodeError は ValueError のサブクラスなので、load() の例外処理はそのまま効く
+try:
+    import orjson
+
+    def _loads(s: str) -> Any:  # noqa: ANN401
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            # 標準の json で書いたファイル (NaN や 64bit を超える整数を含む) は標準の json で読む
+            return _std_loads(s)
+
+    def _dumps(d: dict[str, Any]) -> str:
+        try:
+            return orjson.dumps(d).decode("utf-8")
+        except orjson.JSONEncodeError:
+            # str 以外のキーや 64bit を超える整数を含むメタデータは標準の json で書く
+            return _std_dumps(d)
+
+except ImportError:
+    _loads = _std_loads
+    _dumps = _std_dumps
+
+
+class StoreToJSON(StoreToYAML):
+    """タスクを JSON ファイルに保存するストア。
+
+    メモリ上の操作は StoreToYAML と共通で、ファイルの読み書きだけを JSON で行う。
+    json (orjson があればそちら) は C/Rust 実装のため、YAML よりも load/save が大幅に速い。
+    """
+
+    _FORMAT_NAME = "JSON"
+
+    def _read_raw(self, f: TextIO) -> dict[str, Any] | None:
+        text = f.read()
+        if not text.strip():
+            # get_data_path() が作る空ファイルは空のストアとして扱う
+            return None
+        return _loads(text)  # type: ignore[no-any-return]
+
+    def _write_tasks(self, f: TextIO, tasks: dict[str, Task]) -> None:
+        raw = {"tasks": {tid: tasks[tid].to_dict() for tid in sorted(tasks)}}
+        f.write(_dumps(raw))
+        f.write("\n")
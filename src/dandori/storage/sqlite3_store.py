@@ -1,16 +1,23 @@
 import json
+import logging
 import sqlite3
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from typing import Any
 
 from pyresults import Err, Ok, Result
 
 from dandori.core.models import Task
 from dandori.storage.base import Store
-from dandori.util.logger import setup_logger
 from dandori.util.time import now_iso
 
-logger = setup_logger("dandori", is_stream=True, is_file=True)
+logger = logging.getLogger("dandori")
+
+# 頻繁に実行するクエリ。文字列を固定しておくと sqlite3 の文キャッシュにそのまま載る
+_SQL_GET_TASK = "SELECT * FROM tasks WHERE id = ?"
+_SQL_TASK_EXISTS = "SELECT 1 FROM tasks WHERE id = ?"
+_SQL_PARENTS_OF = "SELECT parent_id FROM edges WHERE child_id = ?"
+_SQL_CHILDREN_OF = "SELECT child_id FROM edges WHERE parent_id = ?"
 
 
 class StoreToSQLite(Store):
@@ -23,18 +30,77 @@ class StoreToSQLite(Store):
     def __init__(self, data_path: str | None = None) -> None:
         super().__init__(data_path)
         self._conn: sqlite3.Connection | None = None
+        # 複合操作 (insert_task / link_tasks / unlink_tasks) の間だけ有効な get_task キャッシュ。
+        # 別のストア (別 DB) の Task を返さないようストアごとに持つ (ストアはスレッド・タスク間で共有しない)
+        self._task_cache: dict[str, Task] | None = None
 
     # ---- low-level helpers ---------------------------------------------
 
     @property
     def conn(self) -> sqlite3.Connection:
         if self._conn is None:
-            self._conn = sqlite3.connect(self.data_path)
+            self._conn = sqlite3.connect(self.data_path, cached_statements=256)
             self._conn.row_factory = sqlite3.Row
             # 外部キー制約と ON DELETE CASCADE を有効化
             self._conn.execute("PRAGMA foreign_keys = ON")
+            # WAL + synchronous=NORMAL でコミットごとの fsync を減らす (インメモリ DB には WAL は不要)
+            if self.data_path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+            self._conn.execute("PRAGMA temp_store = MEMORY")
+            self._conn.execute("PRAGMA cache_size = -8000")
         return self._conn
 
+    @contextmanager
+    def _request_cache(self) -> Iterator[None]:
+        """複合操作の間だけ get_task の結果をキャッシュする.
+
+        ネストした場合は外側のキャッシュをそのまま使い、最も外側の終了時に破棄する。
+        キャッシュ中の get_task は同じ Task オブジェクトを返すので、書き換えは後続の get_task にも見える。
+        """
+        if self._task_cache is not None:
+            yield
+            return
+        self._task_cache = {}
+        try:
+            yield
+        finally:
+            self._task_cache = None
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """ブロック内の書き込みを 1 つのトランザクションにまとめる.
+
+        開始時に書き込みロックを取り、正常終了で 1 回だけ commit する。
+        例外が出た場合は rollback して例外をそのまま送出する。
+        既にトランザクション中 (外側の transaction() や未コミットの書き込みがある) 場合は
+        SAVEPOINT を張り、失敗時はブロック内の変更だけを取り消す。commit は外側に任せる。
+        """
+        c = self.conn
+        if c.in_transaction:
+            c.execute("SAVEPOINT dandori_tx")
+            try:
+                yield
+            except BaseException:
+                self._invalidate_task_cache()
+                c.execute("ROLLBACK TO SAVEPOINT dandori_tx")
+                c.execute("RELEASE SAVEPOINT dandori_tx")
+                raise
+            c.execute("RELEASE SAVEPOINT dandori_tx")
+            return
+        c.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.rollback()
+            raise
+        self.commit()
+
+    def _invalidate_task_cache(self) -> None:
+        """書き込み操作の後に呼び、キャッシュ済みの Task を破棄する."""
+        if self._task_cache is not None:
+            self._task_cache.clear()
+
     def _init_schema(self) -> None:
         """テーブルがなければ作成する."""
         c = self.conn
@@ -73,6 +139,8 @@ class StoreToSQLite(Store):
             )
             """,
         )
+        # edges の主キーは (parent_id, child_id) なので、child_id での検索 (親の取得) 用に索引を張る
+        c.execute("CREATE INDEX IF NOT EXISTS idx_edges_child ON edges (child_id)")
         c.commit()
 
     @staticmethod
@@ -184,6 +252,7 @@ class StoreToSQLite(Store):
             logger.exception(msg)
 
     def rollback(self) -> None:
+        self._invalidate_task_cache()
         try:
             self.conn.rollback()
         except Exception as e:
@@ -193,26 +262,29 @@ class StoreToSQLite(Store):
     # ---- データ取得 -----------------------------------------------------
 
     def get_task(self, task_id: str) -> Result[Task, str]:
+        # 複合操作中 (_request_cache) はキャッシュした Task を共有して返す
+        cache = self._task_cache
+        if cache is not None and (cached := cache.get(task_id)) is not None:
+            return Ok(cached)
+
         c = self.conn
-        cur = c.execute("SELECT * FROM tasks WHERE id = ?", (task_id,))
+        cur = c.execute(_SQL_GET_TASK, (task_id,))
         row = cur.fetchone()
         if row is None:
             msg = f"Task not found: {task_id}"
-            logger.exception(msg)
+            logger.debug(msg)
             return Err(msg)
 
         # まず単体の Task を作る
         t = self._row_to_task(row)
 
         # 親子関係を SQL から埋める
-        deps: list[str] = [
-            r["parent_id"] for r in c.execute("SELECT parent_id FROM edges WHERE child_id = ?", (task_id,))
-        ]
-        children: list[str] = [
-            r["child_id"] for r in c.execute("SELECT child_id FROM edges WHERE parent_id = ?", (task_id,))
-        ]
+        deps: list[str] = [r["parent_id"] for r in c.execute(_SQL_PARENTS_OF, (task_id,))]
+        children: list[str] = [r["child_id"] for r in c.execute(_SQL_CHILDREN_OF, (task_id,))]
         t.depends_on = deps
         t.children = children
+        if cache is not None:
+            cache[task_id] = t
         return Ok(t)
 
     def get_tasks(self, task_ids: list[str]) -> Result[list[Task], str]:
@@ -274,12 +346,13 @@ class StoreToSQLite(Store):
 
         c = self.conn
         try:
-            cur = c.execute("SELECT 1 FROM tasks WHERE id = ?", (task.id,))
+            cur = c.execute(_SQL_TASK_EXISTS, (task.id,))
             if cur.fetchone() is not None:
                 msg = f"Task already exists: {task.id}"
-                logger.exception(msg)
+                logger.debug(msg)
                 return Err(msg)
 
+            self._invalidate_task_cache()
             c.execute(
                 """
                 INSERT INTO tasks (
@@ -314,37 +387,49 @@ class StoreToSQLite(Store):
                 ),
             )
             # task.depends_on を edges に反映 (import/マイグレ等で事前リンクされたタスクを YAML と同様に一貫)
-            now = now_iso()
-            for pid in task.depends_on:
-                cur = c.execute("SELECT 1 FROM tasks WHERE id = ?", (pid,))
-                if cur.fetchone() is None:
-                    continue  # 親未登録はスキップ。後から link_tasks で追加可能
-                cur = c.execute(
-                    "SELECT 1 FROM edges WHERE parent_id = ? AND child_id = ?",
-                    (pid, task.id),
-                )
-                if cur.fetchone() is None:
-                    c.execute(
-                        "INSERT INTO edges (parent_id, child_id) VALUES (?, ?)",
-                        (pid, task.id),
-                    )
-                    c.execute(
-                        "UPDATE tasks SET updated_at = ? WHERE id IN (?, ?)",
-                        (now, pid, task.id),
-                    )
+            if task.depends_on:
+                self._insert_parent_edges(task.id, task.depends_on)
             return Ok(None)
         except Exception as e:
             msg = f"Error (add_task): {e!s}"
             logger.exception(msg)
             return Err(msg)
 
+    def _insert_parent_edges(self, child_id: str, parent_ids: list[str]) -> None:
+        """登録済みの親から child_id へのエッジをまとめて追加する.
+
+        親の存在確認は1回のクエリで行い、エッジは executemany で一括挿入する。
+        親未登録の ID はスキップする (後から link_tasks で追加可能)。
+        """
+        c = self.conn
+        unique_ids = list(dict.fromkeys(parent_ids))
+        placeholders = ",".join("?" * len(unique_ids))
+        rows = c.execute(
+            f"SELECT id FROM tasks WHERE id IN ({placeholders})",  # noqa: S608
+            unique_ids,
+        ).fetchall()
+        existing = {row["id"] for row in rows}
+        parents = [pid for pid in unique_ids if pid in existing]
+        if not parents:
+            return
+        c.executemany(
+            "INSERT OR IGNORE INTO edges (parent_id, child_id) VALUES (?, ?)",
+            [(pid, child_id) for pid in parents],
+        )
+        touched = [*parents, child_id]
+        c.execute(
+            f"UPDATE tasks SET updated_at = ? WHERE id IN ({','.join('?' * len(touched))})",  # noqa: S608
+            (now_iso(), *touched),
+        )
+
     def update_task(self, task: Task) -> Result[None, str]:
         c = self.conn
-        cur = c.execute("SELECT 1 FROM tasks WHERE id = ?", (task.id,))
+        cur = c.execute(_SQL_TASK_EXISTS, (task.id,))
         if cur.fetchone() is None:
             msg = f"Task not found: {task.id}"
-            logger.exception(msg)
+            logger.debug(msg)
             return Err(msg)
+        self._invalidate_task_cache()
         try:
             c.execute(
                 """
@@ -401,11 +486,12 @@ class StoreToSQLite(Store):
             match self.get_task(task_id):
                 case Err(e):
                     msg = f"Error (remove_task): {e}"
-                    logger.exception(msg)
+                    logger.debug(msg)
                     return Err(msg)
                 case Ok(_):
                     pass
 
+            self._invalidate_task_cache()
             # edges は ON DELETE CASCADE でもよいが、明示的に削除しておく
             c.execute("DELETE FROM edges WHERE parent_id = ? OR child_id = ?", (task_id, task_id))
             c.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
@@ -417,42 +503,77 @@ class StoreToSQLite(Store):
 
     def link_tasks(self, parent_id: str, child_id: str) -> Result[None, str]:
         """parent_id -> child_id のエッジを追加 (循環検出付き)."""
-        # 循環検出
-        match self._has_task_cycle(parent_id, child_id):
-            case Ok(True):
-                msg = f"Cycle detected: {parent_id} -> {child_id}"
-                logger.exception(msg)
-                return Err(msg)
-            case Ok(False):
-                pass
-            case Err(e):
-                msg = f"Error (link_tasks/cycle): {e}"
-                logger.exception(msg)
-                return Err(msg)
-            case _:
-                msg = "Unexpected error (link_tasks/cycle)"
+        with self._request_cache():
+            # 循環検出
+            match self._has_task_cycle(parent_id, child_id):
+                case Ok(True):
+                    msg = f"Cycle detected: {parent_id} -> {child_id}"
+                    logger.debug(msg)
+                    return Err(msg)
+                case Ok(False):
+                    pass
+                case Err(e):
+                    msg = f"Error (link_tasks/cycle): {e}"
+                    logger.debug(msg)
+                    return Err(msg)
+                case _:
+                    msg = "Unexpected error (link_tasks/cycle)"
+                    logger.error(msg)
+                    return Err(msg)
+
+            c = self.conn
+            try:
+                # タスク存在確認
+                for tid in (parent_id, child_id):
+                    res = self.get_task(tid)
+                    if res.is_err():
+                        msg = f"Error (link_tasks/get): {res.unwrap_err()}"
+                        logger.debug(msg)
+                        return Err(msg)
+
+                # 既にあれば何もしない
+                cur = c.execute(
+                    "SELECT 1 FROM edges WHERE parent_id = ? AND child_id = ?",
+                    (parent_id, child_id),
+                )
+                if cur.fetchone() is None:
+                    self._invalidate_task_cache()
+                    c.execute(
+                        "INSERT INTO edges (parent_id, child_id) VALUES (?, ?)",
+                        (parent_id, child_id),
+                    )
+                    now = now_iso()
+                    c.execute(
+                        "UPDATE tasks SET updated_at = ? WHERE id IN (?, ?)",
+                        (now, parent_id, child_id),
+                    )
+                return Ok(None)
+            except Exception as e:
+                msg = f"Error (link_tasks): {e!s}"
                 logger.exception(msg)
                 return Err(msg)
 
-        c = self.conn
-        try:
-            # タスク存在確認
-            match (self.get_task(parent_id), self.get_task(child_id)):
-                case (Err(e), _) | (_, Err(e)):
-                    msg = f"Error (link_tasks/get): {e}"
-                    logger.exception(msg)
-                    return Err(msg)
-                case (Ok(_), Ok(_)):
-                    pass
+    def unlink_tasks(self, parent_id: str, child_id: str) -> Result[None, str]:
+        with self._request_cache():
+            c = self.conn
+            try:
+                for tid in (parent_id, child_id):
+                    res = self.get_task(tid)
+                    if res.is_err():
+                        msg = f"Error (unlink_tasks/get): {res.unwrap_err()}"
+                        logger.debug(msg)
+                        return Err(msg)
 
-            # 既にあれば何もしない
-            cur = c.execute(
-                "SELECT 1 FROM edges WHERE parent_id = ? AND child_id = ?",
-                (parent_id, child_id),
-            )
-            if cur.fetchone() is None:
+                cur = c.execute(
+                    "SELECT 1 FROM edges WHERE parent_id = ? AND child_id = ?",
+                    (parent_id, child_id),
+                )
+                if cur.fetchone() is None:
+                    # もともとリンクが無ければ何もしない
+                    return Ok(None)
+                self._invalidate_task_cache()
                 c.execute(
-                    "INSERT INTO edges (parent_id, child_id) VALUES (?, ?)",
+                    "DELETE FROM edges WHERE parent_id = ? AND child_id = ?",
                     (parent_id, child_id),
                 )
                 now = now_iso()
@@ -460,172 +581,121 @@ class StoreToSQLite(Store):
                     "UPDATE tasks SET updated_at = ? WHERE id IN (?, ?)",
                     (now, parent_id, child_id),
                 )
-            return Ok(None)
-        except Exception as e:
-            msg = f"Error (link_tasks): {e!s}"
-            logger.exception(msg)
-            return Err(msg)
+                return Ok(None)
+            except Exception as e:
+                msg = f"Error (unlink_tasks): {e!s}"
+                logger.exception(msg)
+                return Err(msg)
 
-    def unlink_tasks(self, parent_id: str, child_id: str) -> Result[None, str]:
-        c = self.conn
-        try:
-            match (self.get_task(parent_id), self.get_task(child_id)):
-                case (Err(e), _) | (_, Err(e)):
-                    msg = f"Error (unlink_tasks/get): {e}"
-                    logger.exception(msg)
-                    return Err(msg)
-                case (Ok(_), Ok(_)):
-                    pass
+    # ---- アーカイブ / 弱連結成分 ----------------------------------------
 
-            cur = c.execute(
-                "SELECT 1 FROM edges WHERE parent_id = ? AND child_id = ?",
-                (parent_id, child_id),
-            )
-            if cur.fetchone() is None:
-                # もともとリンクが無ければ何もしない
-                return Ok(None)
-            c.execute(
-                "DELETE FROM edges WHERE parent_id = ? AND child_id = ?",
-                (parent_id, child_id),
-            )
-            now = now_iso()
-            c.execute(
-                "UPDATE tasks SET updated_at = ? WHERE id IN (?, ?)",
-                (now, parent_id, child_id),
+    def _component_ids(self, start: str) -> Result[list[str], str]:
+        """Start を含む弱連結成分のタスク ID を再帰 CTE で取得する.
+
+        Task オブジェクトを構築せず ID だけを返すので、アーカイブ更新のように
+        ID しか使わない処理で tags / metadata の JSON デコードを省ける。
+        """
+        try:
+            c = self.conn
+            if c.execute(_SQL_TASK_EXISTS, (start,)).fetchone() is None:
+                msg = f"Task not found: {start}"
+                logger.debug(msg)
+                return Err(msg)
+            # エッジを無向化して start から到達可能なノードを列挙 (UNION で重複除去するので必ず停止する)
+            rows = c.execute(
+                """
+                WITH RECURSIVE
+                    undirected(a, b) AS (
+                        SELECT parent_id, child_id FROM edges
+                        UNION ALL
+                        SELECT child_id, parent_id FROM edges
+                    ),
+                    component(id) AS (
+                        SELECT ?
+                        UNION
+                        SELECT u.b FROM undirected u JOIN component cp ON u.a = cp.id
+                    )
+                SELECT id FROM component
+                """,
+                (start,),
             )
-            return Ok(None)
+            return Ok([r["id"] for r in rows])
         except Exception as e:
-            msg = f"Error (unlink_tasks): {e!s}"
+            msg = f"Error (_component_ids): {e!s}"
             logger.exception(msg)
             return Err(msg)
 
-    # ---- アーカイブ / 弱連結成分 ----------------------------------------
-
     def weakly_connected_component(self, start: str) -> Result[list[Task], str]:
-        try:
-            # start が存在するか先にチェック
-            match self.get_task(start):
-                case Err(e):
-                    msg = f"Error (weakly_connected_component/get): {e}"
-                    logger.exception(msg)
-                    return Err(msg)
-                case Ok(_):
-                    pass
-
-            c = self.conn
-            seen: set[str] = set()
-            stack: list[str] = [start]
-            while stack:
-                cur = stack.pop()
-                if cur in seen:
-                    continue
-                seen.add(cur)
-                # out
-                stack.extend(
-                    r["child_id"] for r in c.execute("SELECT child_id FROM edges WHERE parent_id = ?", (cur,))
-                )
-                # in
-                stack.extend(
-                    r["parent_id"] for r in c.execute("SELECT parent_id FROM edges WHERE child_id = ?", (cur,))
-                )
+        ids_res = self._component_ids(start)
+        if ids_res.is_err():
+            msg = f"Error (weakly_connected_component/component): {ids_res.unwrap_err()}"
+            logger.debug(msg)
+            return Err(msg)
+        return self.get_tasks(ids_res.unwrap())
 
-            tasks: list[Task] = []
-            for tid in seen:
-                match self.get_task(tid):
-                    case Ok(t):
-                        tasks.append(t)
-                    case Err(e):
-                        msg = f"Error (weakly_connected_component/get_task): {e}"
-                        logger.exception(msg)
-                        return Err(msg)
-            return Ok(tasks)
+    def _set_archived(self, ids: list[str], *, flag: bool) -> Result[list[str], str]:
+        if not ids:
+            return Ok([])
+        placeholders = ",".join("?" for _ in ids)
+        now = now_iso()
+        self._invalidate_task_cache()
+        try:
+            self.conn.execute(
+                f"UPDATE tasks SET is_archived = ?, updated_at = ? WHERE id IN ({placeholders})",  # noqa: S608
+                (int(flag), now, *ids),
+            )
+            return Ok(ids)
         except Exception as e:
-            msg = f"Error (weakly_connected_component): {e!s}"
+            msg = f"Error ({'archive' if flag else 'unarchive'}_tasks): {e!s}"
             logger.exception(msg)
             return Err(msg)
 
     def archive_tasks(self, task_id: str) -> Result[list[str], str]:
-        match self.weakly_connected_component(task_id):
-            case Err(e):
-                msg = f"Error (archive_tasks/component): {e}"
-                logger.exception(msg)
-                return Err(msg)
-            case Ok(comp):
-                ids = [t.id for t in comp]
-                if not ids:
-                    return Ok([])
-                placeholders = ",".join("?" for _ in ids)
-                now = now_iso()
-                try:
-                    self.conn.execute(
-                        f"UPDATE tasks SET is_archived = 1, updated_at = ? WHERE id IN ({placeholders})",  # noqa: S608
-                        (now, *ids),
-                    )
-                    return Ok(ids)
-                except Exception as e:
-                    msg = f"Error (archive_tasks): {e!s}"
-                    logger.exception(msg)
-                    return Err(msg)
-            case _:
-                msg = "Unexpected error (archive_tasks/component)"
-                logger.exception(msg)
-                return Err(msg)
+        ids_res = self._component_ids(task_id)
+        if ids_res.is_err():
+            msg = f"Error (archive_tasks/component): {ids_res.unwrap_err()}"
+            logger.debug(msg)
+            return Err(msg)
+        return self._set_archived(ids_res.unwrap(), flag=True)
 
     def unarchive_tasks(self, task_id: str) -> Result[list[str], str]:
-        match self.weakly_connected_component(task_id):
-            case Err(e):
-                msg = f"Error (unarchive_tasks/component): {e}"
-                logger.exception(msg)
-                return Err(msg)
-            case Ok(comp):
-                ids = [t.id for t in comp]
-                if not ids:
-                    return Ok([])
-                placeholders = ",".join("?" for _ in ids)
-                now = now_iso()
-                try:
-                    self.conn.execute(
-                        f"UPDATE tasks SET is_archived = 0, updated_at = ? WHERE id IN ({placeholders})",  # noqa: S608
-                        (now, *ids),
-                    )
-                    return Ok(ids)
-                except Exception as e:
-                    msg = f"Error (unarchive_tasks): {e!s}"
-                    logger.exception(msg)
-                    return Err(msg)
-            case _:
-                msg = "Unexpected error (unarchive_tasks/component)"
-                logger.exception(msg)
-                return Err(msg)
+        ids_res = self._component_ids(task_id)
+        if ids_res.is_err():
+            msg = f"Error (unarchive_tasks/component): {ids_res.unwrap_err()}"
+            logger.debug(msg)
+            return Err(msg)
+        return self._set_archived(ids_res.unwrap(), flag=False)
 
     # ---- 依存関係情報 ---------------------------------------------------
 
+    def _titles_by_id(self, task_ids: list[str]) -> dict[str, str]:
+        """タスク ID -> タイトル の辞書を 1 クエリで取得する (Task は構築しない)."""
+        if not task_ids:
+            return {}
+        ids = list(dict.fromkeys(task_ids))
+        ph = ", ".join("?" for _ in ids)
+        rows = self.conn.execute(
+            "SELECT id, title FROM tasks WHERE id IN (" + ph + ")",  # noqa: S608
+            ids,
+        )
+        return {r["id"]: r["title"] for r in rows}
+
     def get_dependency_info(self, task_id: str) -> Result[dict[str, list[str]], str]:
-        match self.get_task(task_id):
-            case Err(e):
-                msg = f"Error (get_dependency_info/get_task): {e}"
-                logger.exception(msg)
-                return Err(msg)
-            case Ok(t):
-                deps: list[str] = []
-                match self.get_tasks(t.depends_on):
-                    case Ok(pts):
-                        deps.extend([pt.title for pt in pts])
-                    case Err(_):
-                        deps.extend([f"<{pid} not found>" for pid in t.depends_on])
-
-                children: list[str] = []
-                match self.get_tasks(t.children):
-                    case Ok(cts):
-                        children.extend([ct.title for ct in cts])
-                    case Err(_):
-                        children.extend([f"<{cid} not found>" for cid in t.children])
-
-                return Ok({"task": [t.title], "depends_on": deps, "children": children})
-            case _:
-                msg = "Unexpected error (get_dependency_info/get_task)"
-                logger.exception(msg)
-                return Err(msg)
+        t_res = self.get_task(task_id)
+        if t_res.is_err():
+            msg = f"Error (get_dependency_info/get_task): {t_res.unwrap_err()}"
+            logger.debug(msg)
+            return Err(msg)
+        t = t_res.unwrap()
+        try:
+            titles = self._titles_by_id(t.depends_on + t.children)
+        except Exception as e:
+            msg = f"Error (get_dependency_info): {e!s}"
+            logger.exception(msg)
+            return Err(msg)
+        deps = [titles.get(pid, f"<{pid} not found>") for pid in t.depends_on]
+        children = [titles.get(cid, f"<{cid} not found>") for cid in t.children]
+        return Ok({"task": [t.title], "depends_on": deps, "children": children})
 
     # ---- 挿入機能 A -> (new) -> B --------------------------------------
 
@@ -638,21 +708,22 @@ class StoreToSQLite(Store):
         id_overwritten: str | None = None,
     ) -> Result[None, str]:
         """既存のエッジ A->B の間に new_task を挿入 (YAML 実装と同等)."""
-        match (
-            self._add_inserted_task(new_task, id_overwritten=id_overwritten)
-            .and_then(lambda _: self._remove_existing_edge(a, b))
-            .and_then(lambda _: self._link_inserted_task(a, b, new_task))
-        ):
-            case Ok(None):
-                return Ok(None)
-            case Err(e):
-                msg = f"Error (insert_task): {e}"
-                logger.exception(msg)
-                return Err(msg)
-            case _:
-                msg = "Unexpected error (insert_task)"
-                logger.exception(msg)
-                return Err(msg)
+        with self._request_cache():
+            match (
+                self._add_inserted_task(new_task, id_overwritten=id_overwritten)
+                .and_then(lambda _: self._remove_existing_edge(a, b))
+                .and_then(lambda _: self._link_inserted_task(a, b, new_task))
+            ):
+                case Ok(None):
+                    return Ok(None)
+                case Err(e):
+                    msg = f"Error (insert_task): {e}"
+                    logger.debug(msg)
+                    return Err(msg)
+                case _:
+                    msg = "Unexpected error (insert_task)"
+                    logger.error(msg)
+                    return Err(msg)
 
     def _add_inserted_task(
         self,
@@ -664,46 +735,46 @@ class StoreToSQLite(Store):
         return self.add_task(new_task, id_overwritten=id_overwritten)
 
     def _remove_existing_edge(self, a: str, b: str) -> Result[None, str]:
-        match (self.get_task(a), self.get_task(b)):
-            case (Err(e), _) | (_, Err(e)):
-                msg = f"Error (remove_existing_edge/get): {e}"
-                logger.exception(msg)
-                return Err(msg)
-            case (Ok(at), Ok(bt)):
-                if b in at.children and a in bt.depends_on:
-                    return self.unlink_tasks(a, b)
-                return Ok(None)
-            case _:
-                msg = "Unexpected error (remove_existing_edge/get)"
-                logger.exception(msg)
-                return Err(msg)
+        a_res = self.get_task(a)
+        if a_res.is_err():
+            msg = f"Error (remove_existing_edge/get): {a_res.unwrap_err()}"
+            logger.debug(msg)
+            return Err(msg)
+        b_res = self.get_task(b)
+        if b_res.is_err():
+            msg = f"Error (remove_existing_edge/get): {b_res.unwrap_err()}"
+            logger.debug(msg)
+            return Err(msg)
+        if b in a_res.unwrap().children and a in b_res.unwrap().depends_on:
+            return self.unlink_tasks(a, b)
+        return Ok(None)
 
     def _link_inserted_task(self, a: str, b: str, new_task: Task) -> Result[None, str]:
-        match (self.link_tasks(a, new_task.id), self.link_tasks(new_task.id, b)):
-            case (Ok(None), Ok(None)):
-                return Ok(None)
-            case (Err(e), Ok(None)):
-                return self._rollback_on_error(
-                    e,
-                    lambda: self.unlink_tasks(new_task.id, b).and_then(
-                        lambda _: self.remove_task(new_task.id),
-                    ),
-                )
-            case (Ok(None), Err(e)):
-                return self._rollback_on_error(
-                    e,
-                    lambda: self.unlink_tasks(a, new_task.id).and_then(
-                        lambda _: self.remove_task(new_task.id),
-                    ),
-                )
-            case (Err(e1), Err(e2)):
-                msg = f"Failed to link to parent: {e1}, and failed to link to child: {e2}"
-                logger.exception(msg)
-                return Err(msg)
-            case _:
-                msg = "Unexpected error (_link_inserted_task)"
-                logger.exception(msg)
-                return Err(msg)
+        # 親側・子側とも必ず両方試行してから結果を判定する
+        parent_res = self.link_tasks(a, new_task.id)
+        child_res = self.link_tasks(new_task.id, b)
+        if parent_res.is_ok() and child_res.is_ok():
+            return Ok(None)
+        if parent_res.is_err() and child_res.is_err():
+            msg = (
+                f"Failed to link to parent: {parent_res.unwrap_err()}, "
+                f"and failed to link to child: {child_res.unwrap_err()}"
+            )
+            logger.error(msg)
+            return Err(msg)
+        if parent_res.is_err():
+            return self._rollback_on_error(
+                parent_res.unwrap_err(),
+                lambda: self.unlink_tasks(new_task.id, b).and_then(
+                    lambda _: self.remove_task(new_task.id),
+                ),
+            )
+        return self._rollback_on_error(
+            child_res.unwrap_err(),
+            lambda: self.unlink_tasks(a, new_task.id).and_then(
+                lambda _: self.remove_task(new_task.id),
+            ),
+        )
 
     def _rollback_on_error(
         self,
@@ -732,7 +803,7 @@ class StoreToSQLite(Store):
             match self.get_task(child_id):
                 case Err(e):
                     msg = f"Error (_has_task_cycle/get_child): {e}"
-                    logger.exception(msg)
+                    logger.debug(msg)
                     return Err(msg)
                 case Ok(_):
                     pass
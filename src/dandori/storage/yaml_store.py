@@ -1,79 +1,320 @@
 import copy
-from collections.abc import Callable
+import io
+import logging
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
 from pathlib import Path
+from typing import Any, TextIO
 
 import yaml
 from pyresults import Err, Ok, Result
 
 from dandori.core.models import Task
+from dandori.core.validate import BLACK, GRAY, WHITE
 from dandori.storage.base import Store
-from dandori.util.logger import setup_logger
 from dandori.util.time import now_iso
 
-logger = setup_logger("dandori", is_stream=True, is_file=True)
+logger = logging.getLogger("dandori")
+
+# LibYAML が使える場合は C 実装の Loader/Dumper を使う (pure-Python 実装より大幅に速い)
+try:
+    from yaml import CSafeDumper as _Dumper
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeDumper as _Dumper  # type: ignore[assignment]
+    from yaml import SafeLoader as _Loader  # type: ignore[assignment]
+
+
+# 読み込んだファイルの内容のキャッシュ: (形式名, パス) -> (ファイルの状態, {task_id: Task.to_dict()})
+# 同じプロセスで同じファイルを読み直すとき (API サーバーのリクエストごとの load() など)、パースを省く。
+# ファイル数に応じて増え続けないよう、最近使った _LOAD_CACHE_MAX 件だけを残す (LRU)
+_LOAD_CACHE_MAX = 16
+# ファイルの状態 (st_mtime_ns, st_size, st_ino, st_ctime_ns)。どれかが変わっていればパースし直す
+_FileStamp = tuple[int, int, int, int]
+_LoadCacheEntry = tuple[_FileStamp, dict[str, dict[str, Any]]]
+_load_cache: OrderedDict[tuple[str, str], _LoadCacheEntry] = OrderedDict()
+# タイムスタンプの刻みが粗いファイルシステム (FAT は 2 秒) でも、同じ刻みの中で同じサイズに書き換えられると
+# ファイルの状態からは見分けられない。更新からこれより新しいファイルはキャッシュしない
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+def _file_stamp(st: os.stat_result) -> _FileStamp:
+    """キャッシュの鮮度の判定に使うファイルの状態。"""
+    return (st.st_mtime_ns, st.st_size, st.st_ino, st.st_ctime_ns)
+
+
+def _load_cache_get(key: tuple[str, str], st: os.stat_result) -> dict[str, dict[str, Any]] | None:
+    """ファイルの状態が一致するキャッシュを引き、見つかったエントリを最近使ったものとして扱う。"""
+    cached = _load_cache.get(key)
+    if cached is None or cached[0] != _file_stamp(st):
+        return None
+    _load_cache.move_to_end(key)
+    return cached[1]
+
+
+def _load_cache_put(key: tuple[str, str], st: os.stat_result, data: dict[str, dict[str, Any]]) -> None:
+    """読み込みキャッシュに入れ、上限を超えた分は最も古く使われたものから捨てる。
+
+    更新されたばかりのファイルは、同じ刻みの中で書き換えられても気づけないのでキャッシュしない。
+    """
+    if time.time_ns() - max(st.st_mtime_ns, st.st_ctime_ns) < _RACY_WINDOW_NS:
+        _load_cache.pop(key, None)
+        return
+    _load_cache[key] = (_file_stamp(st), data)
+    _load_cache.move_to_end(key)
+    while len(_load_cache) > _LOAD_CACHE_MAX:
+        _load_cache.popitem(last=False)
+
+
+def _drop_ids(ids: list[str], drop: set[str]) -> None:
+    """リスト ids から drop に含まれる ID を1回の走査でまとめて取り除く (リストの同一性は保つ)。
+
+    list.remove() と違い、重複して入っている ID もすべて取り除くので隣接インデックス (set) と食い違わない。
+    """
+    ids[:] = [x for x in ids if x not in drop]
 
 
 class StoreToYAML(Store):
+    # ログ出力に使うファイル形式名 (派生クラスで上書きする)
+    _FORMAT_NAME = "YAML"
+
     def __init__(self, data_path: str | None = None) -> None:
         super().__init__(data_path)
-        self._tasks: dict[str, Task] = {}
+        # コミット済み状態は Task ではなく to_dict() のスナップショットで保持する (deepcopy を避ける)
+        self._committed_raw: dict[str, dict[str, Any]] = {}
         self._tmp_tasks: dict[str, Task] = {}
+        # グラフ構造が変わるたびに進める版数と、版数つきの弱連結成分キャッシュ (成分のタスクIDを探索順に保持)
+        self._graph_version = 0
+        self._wcc_cache: dict[tuple[int, str], list[str]] = {}
+        # 隣接インデックス (task_id -> 子ID集合 / 親ID集合)。Task のリストと常に同期させる
+        # tasks / get_task / get_tasks / weakly_connected_component で Task を外に渡した後は
+        # 直接書き換えられうるので、次に使うときに作り直す (_index_stale)
+        self._children_map: dict[str, set[str]] = {}
+        self._parents_map: dict[str, set[str]] = {}
+        self._index_stale = False
+        # ファイルと作業中の状態が食い違っている可能性があるか (False なら save() は何もしない)
+        self._dirty = False
+        # コミット済みスナップショットが作業中のタスクと一致しているか
+        self._snapshot_fresh = False
+        # 作業中の Task (や辞書) を外からも参照されうるか。True の間は外で書き換えられたかもしれないので、
+        # commit() は必ずスナップショットを取り直す。Task を作り直す load() / rollback() で False に戻る
+        self._shared = False
 
     # ---- 基本IO ----
 
     def load(self) -> None:
         _path = Path(self.data_path)
-        _tasks: dict[str, Task] = {}
-        if _path.exists():
+        try:
+            st = _path.stat()
+        except FileNotFoundError:
+            st = None
+        if st is None or st.st_size == 0:
+            # 新規インストール直後など、ファイルが無い・空の場合は読み込み処理を丸ごと省く
+            self._reset_empty()
+            return
+        key = (self._FORMAT_NAME, str(_path))
+        from_dict = Task.from_dict
+        cached = _load_cache_get(key, st)
+        if cached is not None:
+            # 前回と同じファイルなのでパースを省く。キャッシュとリスト等を共有しないよう、dict を deepcopy してから作る
+            _tasks = {tid: from_dict(copy.deepcopy(td)) for tid, td in cached.items()}
+        else:
             with _path.open(encoding="utf-8") as f:
                 try:
-                    raw = yaml.safe_load(f) or {}
-                except yaml.YAMLError as e:
-                    _msg = f"Failed to load YAML file: {e}"
+                    raw = self._read_raw(f) or {}
+                except (yaml.YAMLError, ValueError) as e:
+                    _msg = f"Failed to load {self._FORMAT_NAME} file: {e}"
                     logger.exception(_msg)
                     # Initialize empty tasks if error occurs
-                    self._tasks = {}
-                    self._tmp_tasks = {}
+                    self._reset_empty()
                     return
-                for tid, td in raw.get("tasks", {}).items():
-                    _tasks[tid] = Task.from_dict(td)
-        else:
-            _tasks = {}
-
-        # treat read content as commited state, and copy the tasks to the internal state
-        self._tasks = copy.deepcopy(_tasks)
-        self._tmp_tasks = copy.deepcopy(_tasks)
+            # Task.from_dict は dataclass の __init__ を直接呼ぶだけなので、そのまま一括生成する
+            # (__init__ を迂回して属性を直接設定する方法は slots クラスでは逆に遅い)
+            _tasks = {tid: from_dict(td) for tid, td in raw.get("tasks", {}).items()}
+            _load_cache_put(key, st, {tid: t.to_dict() for tid, t in _tasks.items()})
+
+        # treat read content as commited state; the read tasks themselves become the working state
+        self._tmp_tasks = _tasks
+        self._shared = False
+        self._rebuild_adjacency()
+        self._touch_graph()
+        self.commit()
+        self._dirty = False
+
+    def _reset_empty(self) -> None:
+        """空のストアとして作業中・コミット済みの状態を初期化する (ファイルとは一致しているとみなす)。"""
+        self._committed_raw = {}
+        self._tmp_tasks = {}
+        self._children_map = {}
+        self._parents_map = {}
+        self._index_stale = False
+        self._touch_graph()
+        self._dirty = False
+        self._snapshot_fresh = True
+        self._shared = False
 
     def save(self) -> None:
         # save the internal state (tasks) to the file
-        raw = {"tasks": {tid: t.to_dict() for tid, t in self.tasks.items()}}
+        if not self._dirty:
+            return
         _path = Path(self.data_path)
-        with _path.open("w", encoding="utf-8") as f:
-            yaml.safe_dump(raw, f, allow_unicode=True, sort_keys=True)
+        # 一時ファイルに書いてから置き換えることで、書き込み途中で落ちてもストアが壊れないようにする
+        _tmp = _path.with_suffix(_path.suffix + ".tmp")
+        # タスクごとの細かい書き込みはメモリ上のバッファにまとめ、ファイルへは 1 回で書く
+        buf = io.StringIO()
+        self._write_tasks(buf, self._tmp_tasks)
+        _tmp.write_text(buf.getvalue(), encoding="utf-8")
+        _tmp.replace(_path)
+        # 書いたばかりのファイルは _load_cache_put がキャッシュしないので、ここでは載せない
+        # (古いエントリはファイルの状態が変わったので使われない)
+        self._dirty = False
+
+    def _read_raw(self, f: TextIO) -> dict[str, Any] | None:
+        """ファイル全体を {"tasks": {...}} 形式の dict として読み込む。空ファイルは None。"""
+        return yaml.load(f, Loader=_Loader)  # type: ignore[no-any-return]
+
+    def _write_tasks(self, f: TextIO, tasks: dict[str, Task]) -> None:
+        """作業中のタスクをファイルに書き出す。"""
+        self._write_tasks_yaml(f, tasks)
+
+    @staticmethod
+    def _write_tasks_yaml(f: TextIO, tasks: dict[str, Task]) -> None:
+        """{"tasks": {...}} をまとめて dump したのと同じ YAML を、タスク1件ずつ dump して書き出す。
+
+        全タスク分の to_dict() を一度に保持しないので、大きなストアでもピークメモリが増えない。
+        """
+        if not tasks:
+            f.write("tasks: {}\n")
+            return
+        f.write("tasks:\n")
+        for tid in sorted(tasks):
+            doc = yaml.dump({tid: tasks[tid].to_dict()}, Dumper=_Dumper, allow_unicode=True, sort_keys=True)
+            # "tasks:" 配下に入れるため各行を 2 桁字下げする (空行はそのまま)
+            f.writelines(("  " + line if line else line) + "\n" for line in doc.split("\n")[:-1])
 
     # ---- データ操作 ----
 
     @property
     def tasks(self) -> dict[str, Task]:
+        """作業中のタスク (呼び出し元が辞書や Task を直接書き換えてもよい)。"""
+        self._handed_out()
         return self._tmp_tasks
 
     @tasks.setter
     def tasks(self, value: dict[str, Task]) -> None:
         self._tmp_tasks = value
+        self._shared = True
+        self._rebuild_adjacency()
+        self._touch_graph()
+
+    def _touch_graph(self) -> None:
+        """グラフ構造 (タスク集合・エッジ) の変更を記録し、弱連結成分キャッシュを破棄する。"""
+        self._graph_version += 1
+        self._wcc_cache.clear()
+        self._dirty = True
+        self._snapshot_fresh = False
+
+    def _handed_out(self) -> None:
+        """作業中のタスクの辞書を外に渡したことを記録する。
+
+        渡した先でタスクの追加や children / depends_on の直接編集がありうるので、
+        隣接インデックスは次に使うときに作り直し、次の commit() ではスナップショットを取り直す。
+        """
+        self._index_stale = True
+        self._shared = True
+
+    @property
+    def _children(self) -> dict[str, set[str]]:
+        """子ID集合のインデックス (古くなっていれば作り直してから返す)。"""
+        if self._index_stale:
+            self._refresh_index()
+        return self._children_map
+
+    @property
+    def _parents(self) -> dict[str, set[str]]:
+        """親ID集合のインデックス (古くなっていれば作り直してから返す)。"""
+        if self._index_stale:
+            self._refresh_index()
+        return self._parents_map
+
+    def _refresh_index(self) -> None:
+        """外で書き換えられた可能性のあるタスクから隣接インデックスを作り直す。
+
+        エッジが変わっていれば弱連結成分キャッシュも破棄する (変わっていなければそのまま使い続ける)。
+        """
+        old = (self._children_map, self._parents_map)
+        self._rebuild_adjacency()
+        if (self._children_map, self._parents_map) != old:
+            self._graph_version += 1
+            self._wcc_cache.clear()
+
+    def _rebuild_adjacency(self) -> None:
+        """作業中のタスクから隣接インデックスを作り直す。"""
+        self._children_map = {tid: set[str](t.children) for tid, t in self._tmp_tasks.items()}
+        self._parents_map = {tid: set[str](t.depends_on) for tid, t in self._tmp_tasks.items()}
+        self._index_stale = False
+
+    def _index_task(self, task: Task) -> None:
+        """呼び出し元から受け取った Task について、隣接インデックスを Task のリストから設定する。"""
+        # 受け取った Task は呼び出し元も参照しているので、以後の commit() ではスナップショットを取り直す
+        self._shared = True
+        self._children[task.id] = set[str](task.children)
+        self._parents[task.id] = set[str](task.depends_on)
+
+    def _has_child(self, parent_id: str, child_id: str) -> bool:
+        """parent_id -> child_id のエッジが両方向 (children / depends_on) に存在するか。"""
+        return child_id in self._children.get(parent_id, ()) and parent_id in self._parents.get(child_id, ())
+
+    def _add_child(self, p: Task, c: Task) -> None:
+        """親 p -> 子 c のエッジを Task のリストと隣接インデックスの両方に追加する。"""
+        p.children.append(c.id)
+        c.depends_on.append(p.id)
+        self._children.setdefault(p.id, set[str]()).add(c.id)
+        self._parents.setdefault(c.id, set[str]()).add(p.id)
+        self._touch_graph()
+
+    def _remove_child(self, p: Task, c: Task) -> None:
+        """親 p -> 子 c のエッジを Task のリストと隣接インデックスの両方から削除する。"""
+        _drop_ids(p.children, {c.id})
+        _drop_ids(c.depends_on, {p.id})
+        self._children.get(p.id, set[str]()).discard(c.id)
+        self._parents.get(c.id, set[str]()).discard(p.id)
+        self._touch_graph()
+
+    @property
+    def _tasks(self) -> dict[str, Task]:
+        """コミット済み状態を Task として返す (参照専用。変更してもスナップショットには反映されない前提)。"""
+        return {tid: Task.from_dict(dict(d)) for tid, d in self._committed_raw.items()}
 
     def commit(self) -> None:
         """変更を永続化する。
 
-        内部の_tasks辞書の内容を永続化します。
+        作業中のタスクを to_dict() でスナップショットし、コミット済み状態とします。
+        前回のスナップショット以降に変更がなく、作業中の Task を外からも参照されていなければ取り直しません。
         """
-        self._tasks = copy.deepcopy(self._tmp_tasks)
+        if self._snapshot_fresh and not self._shared:
+            return
+        snapshot = {tid: t.to_dict() for tid, t in self._tmp_tasks.items()}
+        # Task を直接書き換えて commit() する呼び出し元もあるため、スナップショットが変わっていれば保存対象とする
+        # (読み取りだけの操作の後の commit() / save() ではファイルを書き換えない)
+        if snapshot != self._committed_raw:
+            self._dirty = True
+        self._committed_raw = snapshot
+        self._snapshot_fresh = True
 
     def rollback(self) -> None:
         """変更を破棄する。
 
-        内部の_tasks辞書の内容を破棄します。
+        コミット済みスナップショットから作業中のタスクを復元します。
+        復元したタスクはスナップショットのリストや辞書を共有するため、スナップショットは取り直します。
         """
-        self._tmp_tasks = copy.deepcopy(self._tasks)
+        self._tmp_tasks = {tid: Task.from_dict(d) for tid, d in self._committed_raw.items()}
+        self._shared = False
+        self._rebuild_adjacency()
+        self._touch_graph()
+        self.commit()
 
     # ---- データ取得 ----
 
@@ -87,10 +328,17 @@ class StoreToYAML(Store):
             Ok(Task): 成功時
             Err(str): 失敗時（例: タスクが見つからない）
         """
-        t = self.tasks.get(task_id)
+        res = self._find_task(task_id)
+        if res.is_ok():
+            self._handed_out()
+        return res
+
+    def _find_task(self, task_id: str) -> Result[Task, str]:
+        """get_task と同じくタスクを引くが、Task を外に渡したとは記録しない (内部の参照用)。"""
+        t = self._tmp_tasks.get(task_id)
         if t is None:
             _msg = f"Task not found: {task_id}"
-            logger.exception(_msg)
+            logger.debug(_msg)
             return Err[Task, str](_msg)
         return Ok[Task, str](t)
 
@@ -104,7 +352,11 @@ class StoreToYAML(Store):
             Ok(list[Task]): 成功時（タスクのリスト）
             Err(str): 失敗時
         """
-        return Ok[list[Task], str]([self.tasks[tid] for tid in task_ids if tid in self.tasks])
+        tasks = self._tmp_tasks
+        found = [t for tid in task_ids if (t := tasks.get(tid)) is not None]
+        if found:
+            self._handed_out()
+        return Ok[list[Task], str](found)
 
     def get_all_tasks(self) -> Result[dict[str, Task], str]:
         """全タスクを取得する。
@@ -130,18 +382,43 @@ class StoreToYAML(Store):
         """
         if id_overwritten is not None:
             task.id = id_overwritten
-        match self.get_all_tasks():
-            case Ok(tasks):
-                if task.id in tasks:
-                    _msg = f"Task already exists: {task.id}"
-                    logger.exception(_msg)
-                    return Err[None, str](_msg)
-                self.tasks[task.id] = task
-                return Ok[None, str](None)
-            case _:
-                _msg = "Unexpected error"
-                logger.exception(_msg)
+        if task.id in self._tmp_tasks:
+            _msg = f"Task already exists: {task.id}"
+            logger.debug(_msg)
+            return Err[None, str](_msg)
+        self._tmp_tasks[task.id] = task
+        self._index_task(task)
+        self._touch_graph()
+        return Ok[None, str](None)
+
+    def add_tasks(self, tasks: list[Task]) -> Result[None, str]:
+        """複数のタスクをまとめて追加する。
+
+        ID の重複 (既存タスク・追加分どうし) を先に調べ、1件でもあれば何も追加せずに Err を返す。
+        グラフの版数と弱連結成分キャッシュの更新は最後に1回だけ行う。
+
+        Args:
+            tasks: 追加するタスクのリスト (親子関係は各タスクの depends_on / children で渡す)
+
+        Returns:
+            Ok(None): 成功時
+            Err(str): 失敗時（例: 既に存在するID）
+        """
+        if not tasks:
+            return Ok[None, str](None)
+        current = self._tmp_tasks
+        seen = set[str]()
+        for task in tasks:
+            if task.id in current or task.id in seen:
+                _msg = f"Task already exists: {task.id}"
+                logger.debug(_msg)
                 return Err[None, str](_msg)
+            seen.add(task.id)
+        for task in tasks:
+            current[task.id] = task
+            self._index_task(task)
+        self._touch_graph()
+        return Ok[None, str](None)
 
     def update_task(self, task: Task) -> Result[None, str]:
         """タスクを更新する。
@@ -153,12 +430,14 @@ class StoreToYAML(Store):
             Ok(None): 成功時
             Err(str): 失敗時（例: タスクが見つからない）
         """
-        if task.id not in self.tasks:
+        if task.id not in self._tmp_tasks:
             _msg = f"Task not found: {task.id}"
-            logger.exception(_msg)
+            logger.debug(_msg)
             return Err[None, str](_msg)
         task.updated_at = now_iso()
-        self.tasks[task.id] = task
+        self._tmp_tasks[task.id] = task
+        self._index_task(task)
+        self._touch_graph()
         return Ok[None, str](None)
 
     def remove_task(self, task_id: str) -> Result[None, str]:
@@ -173,23 +452,37 @@ class StoreToYAML(Store):
             Ok(None): 成功時
             Err(str): 失敗時（例: タスクが見つからない）
         """
-        match self.get_task(task_id):
+        match self._find_task(task_id):
             case Ok(t):
-                for pid in t.depends_on[:]:
-                    if (res := self.unlink_tasks(pid, task_id)).is_err():
-                        return res
-                for cid in t.children[:]:
-                    if (res := self.unlink_tasks(task_id, cid)).is_err():
-                        return res
-                del self.tasks[task_id]
+                # 隣接タスクごとに1回だけ触れて、削除対象へのエッジをまとめて取り除く
+                tasks = self._tmp_tasks
+                drop = {task_id}
+                ts = now_iso()
+                for pid in set[str](t.depends_on) | self._parents.get(task_id, set[str]()):
+                    if (p := tasks.get(pid)) is not None:
+                        _drop_ids(p.children, drop)
+                        p.updated_at = ts
+                    self._children.get(pid, set[str]()).discard(task_id)
+                for cid in set[str](t.children) | self._children.get(task_id, set[str]()):
+                    if (c := tasks.get(cid)) is not None:
+                        _drop_ids(c.depends_on, drop)
+                        c.updated_at = ts
+                    self._parents.get(cid, set[str]()).discard(task_id)
+                t.depends_on.clear()
+                t.children.clear()
+                t.updated_at = ts
+                del tasks[task_id]
+                self._children.pop(task_id, None)
+                self._parents.pop(task_id, None)
+                self._touch_graph()
                 return Ok[None, str](None)
             case Err(e):
                 _msg = f"Error (remove): {e}"
-                logger.exception(_msg)
+                logger.debug(_msg)
                 return Err[None, str](_msg)
             case _:
                 _msg = "Unexpected error"
-                logger.exception(_msg)
+                logger.error(_msg)
                 return Err[None, str](_msg)
 
     def link_tasks(self, parent_id: str, child_id: str) -> Result[None, str]:
@@ -210,33 +503,31 @@ class StoreToYAML(Store):
         match self._has_task_cycle(parent_id, child_id):
             case Ok(True):
                 _msg = f"Cycle detected: {parent_id} -> {child_id}"
-                logger.exception(_msg)
+                logger.debug(_msg)
                 return Err[None, str](_msg)
             case Ok(False):
                 pass
             case Err(e):
                 _msg = f"Error (link): {e}"
-                logger.exception(_msg)
+                logger.debug(_msg)
                 return Err[None, str](_msg)
             case _:
                 _msg = "Unexpected error"
-                logger.exception(_msg)
+                logger.error(_msg)
                 return Err[None, str](_msg)
-        match (self.get_task(parent_id), self.get_task(child_id)):
+        match (self._find_task(parent_id), self._find_task(child_id)):
             case (Ok(p), Ok(c)):
-                if child_id not in p.children and parent_id not in c.depends_on:
-                    p.children.append(child_id)
-                    c.depends_on.append(parent_id)
-                    p.updated_at = now_iso()
-                    c.updated_at = now_iso()
+                if not self._has_child(parent_id, child_id):
+                    self._add_child(p, c)
+                    p.updated_at = c.updated_at = now_iso()
                 return Ok[None, str](None)
             case (Err(e), _) | (_, Err(e)):
                 _msg = f"Error (unlink): {e}"
-                logger.exception(_msg)
+                logger.debug(_msg)
                 return Err[None, str](_msg)
             case _:
                 _msg = "Unexpected error"
-                logger.exception(_msg)
+                logger.error(_msg)
                 return Err[None, str](_msg)
 
     def unlink_tasks(self, parent_id: str, child_id: str) -> Result[None, str]:
@@ -252,21 +543,19 @@ class StoreToYAML(Store):
             Ok(None): 成功時
             Err(str): 失敗時（例: タスクが見つからない）
         """
-        match (self.get_task(parent_id), self.get_task(child_id)):
+        match (self._find_task(parent_id), self._find_task(child_id)):
             case (Ok(p), Ok(c)):
-                if child_id in p.children and parent_id in c.depends_on:
-                    p.children.remove(child_id)
-                    c.depends_on.remove(parent_id)
-                    p.updated_at = now_iso()
-                    c.updated_at = now_iso()
+                if self._has_child(parent_id, child_id):
+                    self._remove_child(p, c)
+                    p.updated_at = c.updated_at = now_iso()
                 return Ok[None, str](None)
             case (Err(e), _) | (_, Err(e)):
                 _msg = f"Error (unlink): {e}"
-                logger.exception(_msg)
+                logger.debug(_msg)
                 return Err[None, str](_msg)
             case _:
                 _msg = "Unexpected error"
-                logger.exception(_msg)
+                logger.error(_msg)
                 return Err[None, str](_msg)
 
     # ---- アーカイブ (弱連結成分単位) ----
@@ -284,19 +573,23 @@ class StoreToYAML(Store):
             Ok(list[str]): 成功時（更新されたタスクIDのリスト）
             Err(str): 失敗時（例: タスクが見つからない）
         """
-        match self.weakly_connected_component(task_id):
+        match self._component(task_id):
             case Ok(comp):
+                # 成分内のタスクはすべて同じ時刻で更新する
+                ts = now_iso()
                 for t in comp:
                     t.is_archived = True
-                    t.updated_at = now_iso()
+                    t.updated_at = ts
+                self._dirty = True
+                self._snapshot_fresh = False
                 return Ok[list[str], str]([t.id for t in comp])
             case Err(e):
                 _msg = f"Error (archive): {e}"
-                logger.exception(_msg)
+                logger.debug(_msg)
                 return Err[list[str], str](_msg)
             case _:
                 _msg = "Unexpected error"
-                logger.exception(_msg)
+                logger.error(_msg)
                 return Err[list[str], str](_msg)
 
     def unarchive_tasks(self, task_id: str) -> Result[list[str], str]:
@@ -312,45 +605,61 @@ class StoreToYAML(Store):
             Ok(list[str]): 成功時（更新されたタスクIDのリスト）
             Err(str): 失敗時（例: タスクが見つからない）
         """
-        match self.weakly_connected_component(task_id):
+        match self._component(task_id):
             case Ok(comp):
+                # 成分内のタスクはすべて同じ時刻で更新する
+                ts = now_iso()
                 for t in comp:
                     t.is_archived = False
-                    t.updated_at = now_iso()
+                    t.updated_at = ts
+                self._dirty = True
+                self._snapshot_fresh = False
                 return Ok[list[str], str]([t.id for t in comp])
             case Err(e):
                 _msg = f"Error (unarchive): {e}"
-                logger.exception(_msg)
+                logger.debug(_msg)
                 return Err[list[str], str](_msg)
             case _:
                 _msg = "Unexpected error"
-                logger.exception(_msg)
+                logger.error(_msg)
                 return Err[list[str], str](_msg)
 
     def weakly_connected_component(self, start: str) -> Result[list[Task], str]:
+        res = self._component(start)
+        if res.is_ok():
+            self._handed_out()
+        return res
+
+    def _component(self, start: str) -> Result[list[Task], str]:
+        """弱連結成分を求める (Task を外に渡したとは記録しない内部用。archive_tasks などから使う)。"""
+        # 渡した Task への直接編集を取り込み、古いキャッシュを引かないよう先にインデックスを更新する
+        children_of, parents_of = self._children, self._parents
+        tasks = self._tmp_tasks
+        key = (self._graph_version, start)
+        if (cached := self._wcc_cache.get(key)) is not None:
+            return Ok[list[Task], str]([tasks[tid] for tid in cached])
+
+        # 起点の存在だけ確認し、探索中は Result を介さず辞書を直接引く
+        if start not in tasks:
+            _msg = f"Error (weakly_connected_component): Task not found: {start}"
+            logger.debug(_msg)
+            return Err[list[Task], str](_msg)
+
+        # 積む時点で seen に入れるので、同じタスクがスタックに2回以上載ることはない
         visited_tasks: list[Task] = []
-
-        seen: set[str] = set[str]()
+        seen: set[str] = {start}
         stack: list[str] = [start]
         while stack:
             cur = stack.pop()
-            if cur in seen:
+            t = tasks.get(cur)
+            if t is None:
                 continue
-            seen.add(cur)
-            match self.get_task(cur):
-                case Ok(t):
-                    visited_tasks.append(t)
-                    stack.extend(t.children)
-                    stack.extend(t.depends_on)
-                case Err(e):
-                    _msg = f"Error (weakly_connected_component): {e}"
-                    logger.exception(_msg)
-                    return Err[list[Task], str](_msg)
-                case _:
-                    _msg = "Unexpected error"
-                    logger.exception(_msg)
-                    return Err[list[Task], str](_msg)
-        return Ok[list[Task], str](visited_tasks)
+            visited_tasks.append(t)
+            unseen = (children_of.get(cur, set[str]()) | parents_of.get(cur, set[str]())) - seen
+            seen |= unseen
+            stack.extend(unseen)
+        self._wcc_cache[key] = [t.id for t in visited_tasks]
+        return Ok[list[Task], str](list[Task](visited_tasks))
 
     # ---- 依存関係情報表示 ----
 
@@ -364,20 +673,26 @@ class StoreToYAML(Store):
             Ok(dict): 成功時（{"task": [...], "depends_on": [...], "children": [...]}）
             Err(str): 失敗時（例: タスクが見つからない）
         """
-        match self.get_task(task_id):
+        match self._find_task(task_id):
             case Ok(t):
-                deps = [
-                    self.get_task(pid).map_or(lambda task: task.title, f"<{pid} not found>") for pid in t.depends_on
-                ]
-                chil = [self.get_task(cid).map_or(lambda task: task.title, f"<{cid} not found>") for cid in t.children]
+                # 親子の参照は Result を介さず辞書を直接引く
+                tasks = self._tmp_tasks
+                deps: list[str] = []
+                for pid in t.depends_on:
+                    pt = tasks.get(pid)
+                    deps.append(pt.title if pt is not None else f"<{pid} not found>")
+                chil: list[str] = []
+                for cid in t.children:
+                    ct = tasks.get(cid)
+                    chil.append(ct.title if ct is not None else f"<{cid} not found>")
                 return Ok[dict[str, list[str]], str]({"task": [t.title], "depends_on": deps, "children": chil})
             case Err(e):
                 _msg = f"Error (get_dependency_info): {e}"
-                logger.exception(_msg)
+                logger.debug(_msg)
                 return Err[dict[str, list[str]], str](_msg)
             case _:
                 _msg = "Unexpected error"
-                logger.exception(_msg)
+                logger.error(_msg)
                 return Err[dict[str, list[str]], str](_msg)
 
     # ---- 挿入機能 A -> (new) -> B ----
@@ -414,11 +729,11 @@ class StoreToYAML(Store):
                 return Ok[None, str](None)
             case Err(e):
                 _msg = f"Error (insert_task): {e}"
-                logger.exception(_msg)
+                logger.debug(_msg)
                 return Err[None, str](_msg)
             case _:
                 _msg = "Unexpected error"
-                logger.exception(_msg)
+                logger.error(_msg)
                 return Err[None, str](_msg)
 
     def _add_inserted_task(
@@ -432,18 +747,18 @@ class StoreToYAML(Store):
 
     def _remove_existing_edge(self, a: str, b: str) -> Result[None, str]:
         # もしA->Bが直結していれば切ってA->new, new->B
-        match (self.get_task(a), self.get_task(b)):
-            case (Ok(a_t), Ok(b_t)):
-                if b in a_t.children and a in b_t.depends_on:
+        match (self._find_task(a), self._find_task(b)):
+            case (Ok(_), Ok(_)):
+                if self._has_child(a, b):
                     return self.unlink_tasks(a, b)
                 return Ok[None, str](None)
             case (Err(e), _) | (_, Err(e)):
                 _msg = f"Error (remove_existing_edge): {e}"
-                logger.exception(_msg)
+                logger.debug(_msg)
                 return Err[None, str](_msg)
             case _:
                 _msg = "Unexpected error"
-                logger.exception(_msg)
+                logger.error(_msg)
                 return Err[None, str](_msg)
 
     def _link_inserted_task(self, a: str, b: str, new_task: Task) -> Result[None, str]:
@@ -473,11 +788,11 @@ class StoreToYAML(Store):
                 )
             case (Err(e1), Err(e2)):
                 _msg = f"Failed to link to parent: {e1}, and failed to link to child: {e2}"
-                logger.exception(_msg)
+                logger.error(_msg)
                 return Err[None, str](_msg)
             case _:
                 _msg = "Unexpected error"
-                logger.exception(_msg)
+                logger.error(_msg)
                 return Err[None, str](_msg)
 
     def _rollback_on_error(
@@ -511,24 +826,34 @@ class StoreToYAML(Store):
     # ---- 循環検出 ----
 
     def _has_task_cycle(self, parent_id: str, child_id: str) -> Result[bool, str]:
-        seen: set[str] = set[str]()
-        stack = [child_id]
+        """child_id から子方向に辿って parent_id に到達するか (= parent_id -> child_id が循環を作るか) を調べる。
+
+        WHITE/GRAY/BLACK の色付けと (node, 子イテレータ) の明示スタックによる反復 DFS で、
+        各ノード・各エッジを高々1回ずつしか見ない。
+        """
+        # 起点の存在だけ確認し、探索中は Result を介さず辞書を直接引く
+        tasks = self._tmp_tasks
+        if child_id not in tasks:
+            _msg = f"Error (has_task_cycle): Task not found: {child_id}"
+            logger.debug(_msg)
+            return Err[bool, str](_msg)
+        if child_id == parent_id:
+            return Ok[bool, str](value=True)
+
+        children_of = self._children
+        color: dict[str, int] = {child_id: GRAY}
+        stack: list[tuple[str, Iterator[str]]] = [(child_id, iter(children_of.get(child_id, ())))]
         while stack:
-            cur = stack.pop()
-            if cur in seen:
-                continue
-            seen.add(cur)
-            if cur == parent_id:
-                return Ok[bool, str](value=True)
-            match self.get_task(cur):
-                case Ok(t):
-                    stack.extend(t.children)
-                case Err(e):
-                    _msg = f"Error (has_task_cycle): {e}"
-                    logger.exception(_msg)
-                    return Err[bool, str](_msg)
-                case _:
-                    _msg = "Unexpected error"
-                    logger.exception(_msg)
-                    return Err[bool, str](_msg)
+            node, children = stack[-1]
+            for nxt in children:
+                if nxt == parent_id:
+                    return Ok[bool, str](value=True)
+                if color.get(nxt, WHITE) != WHITE or nxt not in tasks:
+                    continue
+                color[nxt] = GRAY
+                stack.append((nxt, iter(children_of.get(nxt, ()))))
+                break
+            else:
+                color[node] = BLACK
+                stack.pop()
         return Ok[bool, str](value=False)
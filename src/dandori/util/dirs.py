@@ -1,7 +1,14 @@
+import functools
 import getpass
 import os
 from pathlib import Path
 
+# このプロセスで存在を確認済みのディレクトリ (2回目以降は stat/mkdir を省く)
+_ensured_dirs: set[str] = set[str]()
+
+# config.env の解析結果キャッシュ (パス -> (更新時刻ns, サイズ, 設定内容))。ファイルが変われば読み直す
+_config_cache: dict[str, tuple[int, int, dict[str, str]]] = {}
+
 
 def default_username() -> str:
     """デフォルトのユーザー名を取得します。
@@ -15,6 +22,12 @@ def default_username() -> str:
         return "anonymous"
 
 
+@functools.cache
+def _process_username() -> str:
+    """default_username() の結果をプロセス内で使い回す (getpass はログイン名の解決で環境変数や passwd を引くため)。"""
+    return default_username()
+
+
 def get_username() -> str:
     """ユーザー名を取得します。
 
@@ -24,7 +37,7 @@ def get_username() -> str:
     username = os.environ.get("DD_USERNAME")
     if username is not None:
         return username
-    return default_username()
+    return _process_username()
 
 
 def default_profile() -> str:
@@ -111,8 +124,10 @@ def default_home_dir() -> Path:
         Path: デフォルトのホームディレクトリ
     """
     home_dir = Path.home() / ".dandori"
-    if not home_dir.exists():
+    key = home_dir.as_posix()
+    if key not in _ensured_dirs:
         home_dir.mkdir(parents=True, exist_ok=True)
+        _ensured_dirs.add(key)
     return home_dir
 
 
@@ -124,10 +139,24 @@ def load_config() -> dict[str, str]:
     """
     home_dir = default_home_dir()
     env_path = home_dir / "config.env"
-    if not env_path.exists():
+    try:
+        st = env_path.stat()
+    except FileNotFoundError:
         return {}
-    with env_path.open(encoding="utf-8") as f:
-        return dict(line.strip().split("=", 1) for line in f if line.strip() and "=" in line)
+    key = env_path.as_posix()
+    cached = _config_cache.get(key)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return dict(cached[2])
+    config: dict[str, str] = {}
+    # 小さなファイルなので一度に読み込んでから行に分ける
+    for line in env_path.read_text(encoding="utf-8").splitlines():
+        k, sep, v = line.partition("=")
+        # "=" を含まない行と "#" で始まるコメント行は読み飛ばす
+        if not sep or k.lstrip().startswith("#"):
+            continue
+        config[k.strip()] = v.strip()
+    _config_cache[key] = (st.st_mtime_ns, st.st_size, config)
+    return dict(config)
 
 
 def load_env() -> dict[str, str]:
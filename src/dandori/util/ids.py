@@ -1,119 +1,162 @@
-import uuid
+import os
+from bisect import bisect_left
+from collections.abc import Iterable
 from datetime import datetime
 
 from pyresults import Err, Ok, Result
 
-from dandori.util.logger import setup_logger
 from dandori.util.time import JST
 
-logger = setup_logger("dandori", is_stream=True, is_file=True)
+
+def _uuid4_str() -> str:
+    """str(uuid.uuid4()) と同じ形式の文字列を、UUID オブジェクトを作らずに生成する。"""
+    b = bytearray(os.urandom(16))
+    b[6] = (b[6] & 0x0F) | 0x40  # version 4
+    b[8] = (b[8] & 0x3F) | 0x80  # RFC 4122 variant
+    h = b.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
 
 
 def gen_task_id(username: str) -> str:
     ts = datetime.now(JST).strftime("%Y%m%d%H%M%S")
-    return f"{uuid.uuid4()}_{ts}_{username}"
+    return f"{_uuid4_str()}_{ts}_{username}"
+
+
+def gen_task_ids(username: str, n: int) -> list[str]:
+    """gen_task_id と同じ形式の ID を n 個まとめて生成する (タイムスタンプは1回だけ取得する)。"""
+    ts = datetime.now(JST).strftime("%Y%m%d%H%M%S")
+    return [f"{_uuid4_str()}_{ts}_{username}" for _ in range(n)]
+
+
+class IdIndex:
+    """ID の完全一致・前方一致検索用のインデックス。
+
+    完全一致は set で、前方一致はソート済みリストの二分探索で引く。
+    同じ ID 集合に対して何度も parse_id する場合は、一度だけ作って使い回す。
+    """
+
+    __slots__ = ("exact", "sorted_ids")
+
+    def __init__(self, source_ids: Iterable[str]) -> None:
+        self.exact: set[str] = set[str](source_ids)
+        self.sorted_ids: list[str] = sorted(self.exact)
+
+    def candidates(self, s: str, *, limit: int = 2) -> list[str]:
+        """文字列 s に完全一致する ID、無ければ s で始まる ID を最大 limit 件返す。"""
+        if s in self.exact:
+            return [s]
+        found: list[str] = []
+        ids = self.sorted_ids
+        for i in range(bisect_left(ids, s), len(ids)):
+            if not ids[i].startswith(s) or len(found) >= limit:
+                break
+            found.append(ids[i])
+        return found
 
 
 def parse_id(
     s: str,
     *,
-    source_ids: list[str],
+    source_ids: list[str] | IdIndex,
 ) -> Result[str, str]:
     s = s.strip()
     if len(s) == 0:
         return Err("Empty ID")
-    # full ID search
-    candidates = [tid for tid in source_ids if tid == s]
-    # LENGTH_SHORTEND_ID-chars prefix search
-    if len(candidates) == 0:
+    if isinstance(source_ids, IdIndex):
+        candidates = source_ids.candidates(s)
+    # 1回きりの検索ではインデックスを作るより線形探索のほうが安い
+    elif s in source_ids:
+        # full ID search
+        candidates = [s]
+    else:
+        # prefix search
         candidates = [tid for tid in source_ids if tid.startswith(s)]
     # match only one
     if len(candidates) == 1:
         return Ok(candidates[0])
+    return Err(_candidates_error(s, candidates))
+
+
+def _candidates_error(s: str, candidates: list[str]) -> str:
+    """候補が1件に絞れなかったときのエラーメッセージ。"""
     # multiple matches
     if len(candidates) > 1:
-        _msg = f"Ambiguous ID: {s} (multiple tasks. Please set full ID.)"
-        return Err(_msg)
-    _msg = f"Unknown ID: {s} (please set correct ID.)"
-    return Err(_msg)
+        return f"Ambiguous ID: {s} (multiple tasks. Please set full ID.)"
+    return f"Unknown ID: {s} (please set correct ID.)"
 
 
 def parse_ids(
     s: str,
     *,
-    source_ids: list[str],
+    source_ids: list[str] | IdIndex,
     sep: str = ",",
 ) -> Result[list[str], str]:
-    ids: list[str] = []
-    for s_shortend in s.split(sep):
-        match parse_id(
-            s_shortend,
-            source_ids=source_ids,
-        ):
+    tokens = s.split(sep)
+    if not isinstance(source_ids, IdIndex) and len(tokens) == 1:
+        # 1件だけなら、ソート済みインデックスを作るより線形探索のほうが安い
+        match parse_id(tokens[0], source_ids=source_ids):
             case Ok(tid):
-                ids.append(tid)
+                return Ok([tid])
             case Err(e):
                 return Err(e)
+    ids: list[str] = []
+    # インデックスはトークンごとではなく1回だけ作る
+    index = source_ids if isinstance(source_ids, IdIndex) else IdIndex(source_ids)
+    # トークンごとに parse_id を呼んで Result を作らず、インデックスを直接引く
+    for s_shortend in tokens:
+        token = s_shortend.strip()
+        if not token:
+            return Err("Empty ID")
+        candidates = index.candidates(token)
+        if len(candidates) != 1:
+            return Err(_candidates_error(token, candidates))
+        ids.append(candidates[0])
     return Ok(ids)
 
 
 def parse_id_with_msg(
     s: str | None,
     *,
-    source_ids: list[str],
+    source_ids: list[str] | IdIndex,
     msg_buffer: str | None = None,
     can_raise: bool = True,
 ) -> str:
     if s is None:
         return ""
-    match parse_id(
+    _res = parse_id(
         s,
         source_ids=source_ids,
-    ):
-        case Ok(tid):
-            return tid
-        case Err(e):
-            if msg_buffer is not None:
-                msg_buffer += f"Invalid ID: {e}"
-            if can_raise:
-                raise ValueError(e)
-            return ""
-        case _:
-            _msg = "Unexpected error"
-            if msg_buffer is not None:
-                msg_buffer += _msg
-            if can_raise:
-                raise ValueError(_msg)
-            return ""
+    )
+    if _res.is_ok():
+        return _res.unwrap()
+    e = _res.unwrap_err()
+    if msg_buffer is not None:
+        msg_buffer += f"Invalid ID: {e}"
+    if can_raise:
+        raise ValueError(e)
+    return ""
 
 
 def parse_ids_with_msg(
     s: str | None,
     *,
-    source_ids: list[str],
+    source_ids: list[str] | IdIndex,
     sep: str = ",",
     msg_buffer: str | None = None,
     can_raise: bool = True,
 ) -> list[str]:
     if s is None:
         return []
-    match parse_ids(
+    _res = parse_ids(
         s,
         source_ids=source_ids,
         sep=sep,
-    ):
-        case Ok(ids):
-            return ids
-        case Err(e):
-            if msg_buffer is not None:
-                msg_buffer += f"Invalid IDs: {e}"
-            if can_raise:
-                raise ValueError(e)
-            return []
-        case _:
-            _msg = "Unexpected error"
-            if msg_buffer is not None:
-                msg_buffer += _msg
-            if can_raise:
-                raise ValueError(_msg)
-            return []
+    )
+    if _res.is_ok():
+        return _res.unwrap()
+    e = _res.unwrap_err()
+    if msg_buffer is not None:
+        msg_buffer += f"Invalid IDs: {e}"
+    if can_raise:
+        raise ValueError(e)
+    return []
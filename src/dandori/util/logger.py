@@ -17,7 +17,23 @@ def setup_logger(
     is_stream: bool = True,
     is_file: bool = True,
 ) -> logging.Logger:
+    """ロガーにハンドラを設定します。
+
+    各モジュールは import 時に ``logging.getLogger("dandori")`` でロガーを取るだけにして、
+    ハンドラはエントリポイント (CLI の main) からこの関数で1回だけ設定します。
+
+    Args:
+        name: ロガー名
+        is_stream: 標準エラー出力に出すか
+        is_file: ログファイルに出すか (最初のログ出力までファイルは開かない)
+
+    Returns:
+        logging.Logger: ロガー
+    """
     logger = logging.getLogger(name)
+    # 設定済みのロガーにハンドラを重ねて付けない (出力の重複とログファイルの多重オープンを防ぐ)
+    if logger.handlers:
+        return logger
     logger.setLevel(logging.DEBUG)
 
     if is_stream or not is_file:
@@ -34,6 +50,8 @@ def setup_logger(
             interval=1,
             backupCount=7,
             encoding="utf-8",
+            # 最初のログ出力まで logファイルを開かない
+            delay=True,
         )
         time_rotate_file_handler.setLevel(logging.DEBUG)
         formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
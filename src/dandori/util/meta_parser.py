@@ -1,3 +1,5 @@
+import copy
+import functools
 import json
 from typing import Any, Literal
 
@@ -5,6 +7,38 @@ import yaml
 from pyresults import Err, Ok, Result
 
 
+def _std_json_loads(s: str) -> Any:  # noqa: ANN401
+    return json.loads(s)
+
+
+# orjson がインストールされていれば JSON のパースに使う (標準の json より数倍速い)。
+# orjson が読めない入力 (NaN、64bit を超える整数など) は標準の json に任せ、どちらでも同じ結果になるようにする。
+# 書き出しは保存済みのメタデータと形式を揃えるため、常に標準の json.dumps を使う
+try:
+    import orjson
+
+    def _json_loads(s: str) -> Any:  # noqa: ANN401
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            return _std_json_loads(s)
+
+except ImportError:
+    _json_loads = _std_json_loads
+
+# LibYAML が使える場合は C 実装の Loader/Dumper を使う (pure-Python 実装より大幅に速い)
+try:
+    from yaml import CSafeDumper as _Dumper
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeDumper as _Dumper  # type: ignore[assignment]
+    from yaml import SafeLoader as _Loader  # type: ignore[assignment]
+
+
+# JSON の値として有効な文字列の先頭文字 (object / array / string / number / true / false / null)
+_JSON_FIRST_CHARS = frozenset('{["-0123456789tfn')
+
+
 def serialize(
     metadata: str,
     parser: Literal["json", "yaml"] | None = None,
@@ -15,9 +49,12 @@ def serialize(
         return serialize_by_yaml(metadata)
 
     # parser is None, auto-detect
-    by_json = serialize_by_json(metadata)
-    if by_json.is_ok():
-        return by_json
+    # 先頭文字から JSON になりえないと分かる場合 (key: value 形式の YAML など) は、
+    # 失敗が確定している JSON のパースと例外処理を省いて YAML に進む
+    if metadata.lstrip()[:1] in _JSON_FIRST_CHARS:
+        by_json = serialize_by_json(metadata)
+        if by_json.is_ok():
+            return by_json
 
     by_yaml = serialize_by_yaml(metadata)
     if by_yaml.is_ok():
@@ -30,24 +67,26 @@ def deserialize(
     metadata: dict[str, Any],
     parser: Literal["json", "yaml"] | None = None,
 ) -> Result[str, str]:
+    if parser == "json":
+        return deserialize_by_json(metadata)
+    if parser == "yaml":
+        return deserialize_by_yaml(metadata)
+
+    # parser is None, try JSON first and fall back to YAML only when it fails
     by_json = deserialize_by_json(metadata)
+    if by_json.is_ok():
+        return by_json
+
     by_yaml = deserialize_by_yaml(metadata)
-    match parser:
-        case "json":
-            return by_json
-        case "yaml":
-            return by_yaml
-        case None:
-            if by_json.is_ok():
-                return by_json
-            if by_yaml.is_ok():
-                return by_yaml
-            return Err(f"Invalid metadata: {metadata!s}")
+    if by_yaml.is_ok():
+        return by_yaml
+
+    return Err(f"Invalid metadata: {metadata!s}")
 
 
 def serialize_by_json(metadata: str) -> Result[dict[str, Any], str]:
     try:
-        return Ok(json.loads(metadata))
+        return Ok(_json_loads(metadata))
     except json.JSONDecodeError as e:
         return Err(f"Invalid JSON: {e!s}")
     except Exception as e:  # noqa: BLE001
@@ -63,18 +102,54 @@ def deserialize_by_json(metadata: dict[str, Any]) -> Result[str, str]:
         return Err(f"Unknown error: {e!s}")
 
 
+@functools.lru_cache(maxsize=256)
+def _load_yaml_cached(metadata: str) -> Any:  # noqa: ANN401
+    """同じ文字列の YAML は1度だけパースする (呼び出し側には serialize_by_yaml がコピーを返す)。"""
+    return yaml.load(metadata, Loader=_Loader)
+
+
 def serialize_by_yaml(metadata: str) -> Result[dict[str, Any], str]:
     try:
-        return Ok(yaml.safe_load(metadata))
+        # YAML のパースは deepcopy より10倍ほど遅いので、結果をキャッシュしてコピーを返す。
+        # (JSON は json.loads の方が deepcopy より速いのでキャッシュしない)
+        return Ok(copy.deepcopy(_load_yaml_cached(metadata)))
     except yaml.YAMLError as e:
         return Err(f"Invalid YAML: {e!s}")
     except Exception as e:  # noqa: BLE001
         return Err(f"Unknown error: {e!s}")
 
 
+# yaml.dump の出力キャッシュ。キーはキー順を正規化した JSON 文字列、値は (元の metadata のコピー, YAML 出力)
+_DUMP_YAML_CACHE: dict[str, tuple[dict[str, Any], str]] = {}
+_DUMP_YAML_CACHE_MAX = 256
+
+
+def _dump_yaml(metadata: dict[str, Any]) -> str:
+    """辞書 metadata を YAML 文字列にする。同じ内容の辞書なら前回の出力を使い回す。
+
+    yaml.dump はキーをソートして出力するので、sort_keys した JSON をキーにしても出力は変わらない。
+    int のキーや tuple は JSON にすると str のキーや list と区別できなくなるので、
+    キャッシュに残した元の辞書と == で比べ、一致したときだけ出力を使い回す。
+    """
+    try:
+        canonical = json.dumps(metadata, sort_keys=True, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return str(yaml.dump(metadata, Dumper=_Dumper))
+    if (hit := _DUMP_YAML_CACHE.get(canonical)) is not None and hit[0] == metadata:
+        return hit[1]
+    out = str(yaml.dump(metadata, Dumper=_Dumper))
+    if hit is None:
+        if len(_DUMP_YAML_CACHE) >= _DUMP_YAML_CACHE_MAX:
+            # 一番古いエントリから捨てる
+            del _DUMP_YAML_CACHE[next(iter(_DUMP_YAML_CACHE))]
+        _DUMP_YAML_CACHE[canonical] = (copy.deepcopy(metadata), out)
+    return out
+
+
 def deserialize_by_yaml(metadata: dict[str, Any]) -> Result[str, str]:
     try:
-        return Ok(yaml.safe_dump(metadata))
+        # yaml.dump は JSON の正規化 + 辞書の比較より数倍遅いので、同じ内容なら出力を使い回す
+        return Ok(_dump_yaml(metadata))
     except yaml.YAMLError as e:
         return Err(f"Invalid YAML: {e!s}")
     except Exception as e:  # noqa: BLE001
@@ -16,13 +16,36 @@ def now_iso() -> str:
     return datetime.now(JST).strftime(ISO_FMT)
 
 
-def format_requested_sla(t: "Task") -> Result[str, str]:
+def parse_jst(s: str) -> datetime:
+    """now_iso() 形式 (タイムゾーンなし、JST 基準) の日時文字列を JST の datetime にする。
+
+    タイムゾーン付きの ISO 8601 文字列はそのタイムゾーンから JST に変換する。
+    """
+    dt = datetime.fromisoformat(s)
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=JST)
+    return dt.astimezone(JST)
+
+
+def format_requested_sla(t: "Task", *, now: datetime | None = None) -> Result[str, str]:
+    """依頼からの経過時間と SLA 残り時間を表示用の文字列にする。
+
+    Args:
+        t: 対象タスク
+        now: 基準時刻。一覧表示などで複数タスクを整形する場合は、呼び出し側で1回だけ取得して渡す
+
+    Returns:
+        Ok(str): 成功時（依頼されていないタスクは空文字列）
+        Err(str): 失敗時（日時のパースに失敗した場合）
+    """
     base = ""
     if not t.requested_at:
         return Ok[str, str](base)
+    if now is None:
+        now = datetime.now(JST)
     try:
-        req = datetime.strptime(t.requested_at, ISO_FMT).astimezone(JST)
-        delta = datetime.now(JST) - req
+        req = parse_jst(t.requested_at)
+        delta = now - req
         days = delta.days
         hours = delta.seconds // 3600
         base += f"+{days}d{hours}h"  # 依頼からの経過時間
@@ -31,8 +54,8 @@ def format_requested_sla(t: "Task") -> Result[str, str]:
 
     if t.due_date:
         try:
-            due = datetime.strptime(t.due_date, ISO_FMT).astimezone(JST)
-            remain = due - datetime.now(JST)
+            due = parse_jst(t.due_date)
+            remain = due - now
             rdays = remain.days
             rhours = max(0, remain.seconds // 3600)
             base += f" / SLA:{rdays}d{rhours}h"
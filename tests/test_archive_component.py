@@ -2,6 +2,7 @@ import os
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 from dandori.core.models import Task
 from dandori.storage.yaml_store import StoreToYAML
@@ -10,10 +11,12 @@ from dandori.storage.yaml_store import StoreToYAML
 class TestArchiveComponent(unittest.TestCase):
     """archive_component が弱連結成分単位で動いていることのテスト"""
 
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.enterClassContext(mock.patch.dict(os.environ, {"DD_USERNAME": "test_user"}))
+
     def setUp(self) -> None:
         """各テストの前に一時ファイルを作成"""
-        self.original_username = os.environ.get("DD_USERNAME")
-        os.environ["DD_USERNAME"] = "test_user"
         self.temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".yaml")  # noqa: SIM115
         self.temp_file.close()
         self.store = StoreToYAML(data_path=self.temp_file.name)
@@ -22,10 +25,6 @@ class TestArchiveComponent(unittest.TestCase):
     def tearDown(self) -> None:
         """各テストの後に一時ファイルを削除"""
         Path(self.temp_file.name).unlink(missing_ok=True)
-        if self.original_username is not None:
-            os.environ["DD_USERNAME"] = self.original_username
-        elif "DD_USERNAME" in os.environ:
-            del os.environ["DD_USERNAME"]
 
     def test_archive_component_archives_connected_tasks(self) -> None:
         """弱連結成分の全タスクがアーカイブされることを確認"""
@@ -110,6 +109,24 @@ class TestArchiveComponent(unittest.TestCase):
         assert self.store.get_task("task_a").unwrap().is_archived is False
         assert self.store.get_task("task_b").unwrap().is_archived is False
 
+    def test_component_reflects_links_after_cached_lookup(self) -> None:
+        """弱連結成分のキャッシュがリンク変更で無効化されることを確認"""
+        task_a = Task(id="task_a", title="タスクA", owner="test_user")
+        task_b = Task(id="task_b", title="タスクB", owner="test_user")
+        self.store.add_task(task_a)
+        self.store.add_task(task_b)
+
+        first = self.store.weakly_connected_component("task_a").unwrap()
+        assert {t.id for t in first} == {"task_a"}
+
+        self.store.link_tasks("task_a", "task_b")
+        linked = self.store.weakly_connected_component("task_a").unwrap()
+        assert {t.id for t in linked} == {"task_a", "task_b"}
+
+        self.store.unlink_tasks("task_a", "task_b")
+        unlinked = self.store.weakly_connected_component("task_a").unwrap()
+        assert {t.id for t in unlinked} == {"task_a"}
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -2,6 +2,7 @@ import os
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 from dandori.core.models import Task
 from dandori.storage.yaml_store import StoreToYAML
@@ -10,10 +11,12 @@ from dandori.storage.yaml_store import StoreToYAML
 class TestCycleDetection(unittest.TestCase):
     """循環を起こす link がちゃんとエラーになることのテスト"""
 
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.enterClassContext(mock.patch.dict(os.environ, {"DD_USERNAME": "test_user"}))
+
     def setUp(self) -> None:
         """各テストの前に一時ファイルを作成"""
-        self.original_username = os.environ.get("DD_USERNAME")
-        os.environ["DD_USERNAME"] = "test_user"
         self.temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".yaml")  # noqa: SIM115
         self.temp_file.close()
         self.store = StoreToYAML(data_path=self.temp_file.name)
@@ -22,10 +25,6 @@ class TestCycleDetection(unittest.TestCase):
     def tearDown(self) -> None:
         """各テストの後に一時ファイルを削除"""
         Path(self.temp_file.name).unlink(missing_ok=True)
-        if self.original_username is not None:
-            os.environ["DD_USERNAME"] = self.original_username
-        elif "DD_USERNAME" in os.environ:
-            del os.environ["DD_USERNAME"]
 
     def test_direct_cycle_detection(self) -> None:
         """直接的な循環（A→A）が検出される"""
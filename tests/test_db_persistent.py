@@ -1,11 +1,14 @@
 import os
 import tempfile
 import unittest
+from collections import OrderedDict
 from pathlib import Path
+from unittest import mock
 
 import yaml
 
 from dandori.core.models import Task
+from dandori.storage import yaml_store
 from dandori.storage.sqlite3_store import StoreToSQLite
 from dandori.storage.yaml_store import StoreToYAML
 
@@ -13,10 +16,12 @@ from dandori.storage.yaml_store import StoreToYAML
 class TestYAMLDBPersistent(unittest.TestCase):
     """StoreToYAML の永続化と commit/rollback に関するテスト"""
 
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.enterClassContext(mock.patch.dict(os.environ, {"DD_USERNAME": "test_user"}))
+
     def setUp(self) -> None:
         """各テストの前に一時ファイルを作成"""
-        self.original_username = os.environ.get("DD_USERNAME")
-        os.environ["DD_USERNAME"] = "test_user"
         self.temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".yaml")  # noqa: SIM115
         self.temp_file.close()
         self.store = StoreToYAML(data_path=self.temp_file.name)
@@ -25,10 +30,6 @@ class TestYAMLDBPersistent(unittest.TestCase):
     def tearDown(self) -> None:
         """各テストの後に一時ファイルを削除"""
         Path(self.temp_file.name).unlink(missing_ok=True)
-        if self.original_username is not None:
-            os.environ["DD_USERNAME"] = self.original_username
-        elif "DD_USERNAME" in os.environ:
-            del os.environ["DD_USERNAME"]
 
     def test_commit_persists_changes(self) -> None:
         """Commit で変更が _tasks に反映されることを確認"""
@@ -264,27 +265,149 @@ class TestYAMLDBPersistent(unittest.TestCase):
         assert "task_b" in task_a_loaded.children
         assert "task_a" in task_b_loaded.depends_on
 
+    def test_save_skipped_when_clean(self) -> None:
+        """変更がなければ save() はファイルを書き換えないことを確認"""
+        task_a = Task(id="task_a", title="タスクA", owner="test_user")
+        self.store.add_task(task_a)
+        self.store.commit()
+        self.store.save()
+        assert not Path(self.temp_file.name + ".tmp").exists()
+
+        # 外部で書き換えたファイルは、変更のない save() で上書きされない
+        Path(self.temp_file.name).write_text("tasks: {}\n", encoding="utf-8")
+        self.store.save()
+        assert Path(self.temp_file.name).read_text(encoding="utf-8") == "tasks: {}\n"
+
+        # 変更後の save() では書き出される
+        self.store.add_task(Task(id="task_b", title="タスクB", owner="test_user"))
+        self.store.save()
+        with Path(self.temp_file.name).open(encoding="utf-8") as f:
+            data = yaml.safe_load(f)
+        assert set(data["tasks"]) == {"task_a", "task_b"}
+
+    def test_commit_picks_up_changes_to_held_task(self) -> None:
+        """commit() より前に受け取った Task をその後に書き換えても、次の commit()/save() に反映されることを確認"""
+        self.store.add_task(Task(id="task_a", title="A", owner="test_user"))
+        t = self.store.get_task("task_a").unwrap()
+        self.store.commit()
+        self.store.save()
+
+        t.title = "B"
+        self.store.commit()
+        self.store.save()
+        self.store.rollback()
+        assert self.store.get_task("task_a").unwrap().title == "B"
+
+        reloaded = StoreToYAML(data_path=self.temp_file.name)
+        reloaded.load()
+        assert reloaded.get_task("task_a").unwrap().title == "B"
+
+    def test_commit_reuses_snapshot_until_tasks_are_shared(self) -> None:
+        """load() 直後の commit() はスナップショットを取り直さず、Task を渡した後や受け取った後は取り直す"""
+        self.store.add_task(Task(id="task_a", title="A", owner="test_user"))
+        self.store.commit()
+        self.store.save()
+
+        store = StoreToYAML(data_path=self.temp_file.name)
+        store.load()
+        snapshot = store._committed_raw  # noqa: SLF001
+        store.commit()
+        assert store._committed_raw is snapshot  # noqa: SLF001
+
+        # get_task で受け取った Task を直接書き換えて commit() しても反映される
+        store.get_task("task_a").unwrap().title = "B"
+        store.commit()
+        store.rollback()
+        assert store.get_task("task_a").unwrap().title == "B"
+
+        # add_task に渡した Task を commit() の後に書き換えても、次の commit() に反映される
+        task_b = Task(id="task_b", title="C", owner="test_user")
+        store.add_task(task_b)
+        store.commit()
+        task_b.title = "D"
+        store.commit()
+        store.rollback()
+        assert store.get_task("task_b").unwrap().title == "D"
+
+    def test_load_reuses_parsed_content(self) -> None:
+        """同じファイルの2回目の load() はパース済みの内容を再利用し、別ストアとリストを共有しないことを確認"""
+        self.enterContext(mock.patch.object(yaml_store, "_RACY_WINDOW_NS", 0))
+        self.store.add_task(Task(id="task_a", title="タスクA", owner="test_user"))
+        self.store.add_task(Task(id="task_b", title="タスクB", owner="test_user"))
+        self.store.link_tasks("task_a", "task_b")
+        self.store.commit()
+        self.store.save()
+
+        first = StoreToYAML(data_path=self.temp_file.name)
+        first.load()
+        second = StoreToYAML(data_path=self.temp_file.name)
+        second.load()
+        first.get_task("task_a").unwrap().children.append("task_x")
+        assert second.get_task("task_a").unwrap().children == ["task_b"]
+
+        # 外部でファイルが書き換えられたら読み直す
+        Path(self.temp_file.name).write_text("tasks: {}\n", encoding="utf-8")
+        third = StoreToYAML(data_path=self.temp_file.name)
+        third.load()
+        assert third.get_all_tasks().unwrap() == {}
+
+    def test_load_cache_keeps_recent_files_only(self) -> None:
+        """読み込みキャッシュは上限件数を超えると最も古く使われたファイルから捨てる"""
+        self.enterContext(mock.patch.object(yaml_store, "_LOAD_CACHE_MAX", 2))
+        self.enterContext(mock.patch.object(yaml_store, "_RACY_WINDOW_NS", 0))
+        self.enterContext(mock.patch.object(yaml_store, "_load_cache", OrderedDict()))
+        tmp_dir = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        paths = [str(tmp_dir / f"{name}.yaml") for name in ("a", "b", "c")]
+        for path in paths:
+            Path(path).write_text("tasks: {}\n", encoding="utf-8")
+        for path in (paths[0], paths[1], paths[0], paths[2]):
+            StoreToYAML(data_path=path).load()
+        assert [p for _, p in yaml_store._load_cache] == [paths[0], paths[2]]  # noqa: SLF001
+
+    def test_load_cache_detects_same_size_replacement(self) -> None:
+        """同じサイズ・同じ更新時刻のファイルに置き換えられても、キャッシュではなく新しい内容を読む"""
+        self.enterContext(mock.patch.object(yaml_store, "_load_cache", OrderedDict()))
+        self.enterContext(mock.patch.object(yaml_store, "_RACY_WINDOW_NS", 0))
+        path = Path(self.temp_file.name)
+        path.write_text("tasks:\n  ta:\n    title: A\n", encoding="utf-8")
+        mtime_ns = path.stat().st_mtime_ns
+        StoreToYAML(data_path=self.temp_file.name).load()
+        assert len(yaml_store._load_cache) == 1  # noqa: SLF001
+
+        # エディタの保存のように、別ファイルに書いて置き換え、更新時刻も元に戻す (st_ino が変わる)
+        replacement = path.with_suffix(".new")
+        replacement.write_text("tasks:\n  ta:\n    title: B\n", encoding="utf-8")
+        os.utime(replacement, ns=(mtime_ns, mtime_ns))
+        replacement.replace(path)
+        store = StoreToYAML(data_path=self.temp_file.name)
+        store.load()
+        assert store.get_task("ta").unwrap().title == "B"
+
+    def test_load_cache_skips_recently_modified_file(self) -> None:
+        """更新されたばかりのファイルは、同じ刻みの中での書き換えに気づけないのでキャッシュしない"""
+        self.enterContext(mock.patch.object(yaml_store, "_load_cache", OrderedDict()))
+        Path(self.temp_file.name).write_text("tasks:\n  ta:\n    title: A\n", encoding="utf-8")
+        StoreToYAML(data_path=self.temp_file.name).load()
+        assert len(yaml_store._load_cache) == 0  # noqa: SLF001
+
 
 class TestSQLiteDBPersistent(unittest.TestCase):
     """StoreToSQLite の永続化と commit/rollback に関するテスト"""
 
+    tmp_dir: Path
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """一時ディレクトリはクラスで1つ作り、WAL の補助ファイルごと最後にまとめて削除する"""
+        cls.enterClassContext(mock.patch.dict(os.environ, {"DD_USERNAME": "test_user"}))
+        cls.tmp_dir = Path(cls.enterClassContext(tempfile.TemporaryDirectory()))
+
     def setUp(self) -> None:
-        """各テストの前に一時ファイルを作成"""
-        self.original_username = os.environ.get("DD_USERNAME")
-        os.environ["DD_USERNAME"] = "test_user"
-        self.temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".db")  # noqa: SIM115
-        self.temp_file.close()
-        self.store = StoreToSQLite(data_path=self.temp_file.name)
+        """テストごとに別名の DB ファイルを使う"""
+        self.data_path = str(self.tmp_dir / f"{self._testMethodName}.db")
+        self.store = StoreToSQLite(data_path=self.data_path)
         self.store.load()
 
-    def tearDown(self) -> None:
-        """各テストの後に一時ファイルを削除"""
-        Path(self.temp_file.name).unlink(missing_ok=True)
-        if self.original_username is not None:
-            os.environ["DD_USERNAME"] = self.original_username
-        elif "DD_USERNAME" in os.environ:
-            del os.environ["DD_USERNAME"]
-
     def test_commit_persists_changes(self) -> None:
         """Commit で変更が _tasks に反映されることを確認"""
         # 初期状態
@@ -352,7 +475,7 @@ class TestSQLiteDBPersistent(unittest.TestCase):
         self.store.save()
 
         # 新しいストアインスタンスで読み込み
-        new_store = StoreToSQLite(data_path=self.temp_file.name)
+        new_store = StoreToSQLite(data_path=self.data_path)
         new_store.load()
 
         # タスクが読み込まれている
@@ -368,7 +491,7 @@ class TestSQLiteDBPersistent(unittest.TestCase):
         self.store.save()  # commit せずに save
 
         # 新しいストアインスタンスで読み込み
-        new_store = StoreToSQLite(data_path=self.temp_file.name)
+        new_store = StoreToSQLite(data_path=self.data_path)
         new_store.load()
 
         # save は _tmp_tasks を保存するので、読み込まれる
@@ -10,6 +10,21 @@ import pytest
 from dandori.util import dirs
 
 
+def _set_or_unset(key: str, value: str | None) -> None:
+    """値 value が None なら環境変数を削除し、そうでなければ設定する"""
+    if value is None:
+        os.environ.pop(key, None)
+    else:
+        os.environ[key] = value
+
+
+class _EnvRestoringTestCase(unittest.TestCase):
+    """テスト中の環境変数の変更を、テスト終了時にまとめて元に戻す TestCase"""
+
+    def setUp(self) -> None:
+        self.enterContext(mock.patch.dict(os.environ))
+
+
 class TestDefaultUsername(unittest.TestCase):
     def test_returns_str(self) -> None:
         assert isinstance(dirs.default_username(), str)
@@ -20,97 +35,69 @@ class TestDefaultUsername(unittest.TestCase):
             assert dirs.default_username() == "anonymous"
 
 
-class TestGetUsername(unittest.TestCase):
-    def setUp(self) -> None:
-        self.original = os.environ.get("DD_USERNAME")
-
-    def tearDown(self) -> None:
-        if self.original is not None:
-            os.environ["DD_USERNAME"] = self.original
-        elif "DD_USERNAME" in os.environ:
-            del os.environ["DD_USERNAME"]
-
+class TestGetUsername(_EnvRestoringTestCase):
     def test_uses_env_when_set(self) -> None:
         os.environ["DD_USERNAME"] = "env_user"
         assert dirs.get_username() == "env_user"
 
     def test_falls_back_when_env_unset(self) -> None:
-        if "DD_USERNAME" in os.environ:
-            del os.environ["DD_USERNAME"]
+        os.environ.pop("DD_USERNAME", None)
         out = dirs.get_username()
         assert isinstance(out, str)
         assert out in (dirs.default_username(), "anonymous") or len(out) > 0
 
+    def test_fallback_resolves_login_name_once(self) -> None:
+        os.environ.pop("DD_USERNAME", None)
+        dirs._process_username.cache_clear()  # noqa: SLF001
+        self.addCleanup(dirs._process_username.cache_clear)  # noqa: SLF001
+        with mock.patch("dandori.util.dirs.getpass.getuser", return_value="login_user") as getuser:
+            assert dirs.get_username() == "login_user"
+            assert dirs.get_username() == "login_user"
+        getuser.assert_called_once()
+        # 環境変数の指定はキャッシュより優先される
+        os.environ["DD_USERNAME"] = "env_user"
+        assert dirs.get_username() == "env_user"
+
 
 class TestDefaultProfile(unittest.TestCase):
     def test_returns_default(self) -> None:
         assert dirs.default_profile() == "default"
 
 
-class TestGetProfile(unittest.TestCase):
-    def setUp(self) -> None:
-        self.original = os.environ.get("DD_PROFILE")
+class TestGetProfile(_EnvRestoringTestCase):
+    def test_env_or_default(self) -> None:
+        # 環境変数あり/なしの両方を1つのテストで確認する (None は未設定)
+        for env_val, expected in (("myprofile", "myprofile"), (None, "default")):
+            with self.subTest(env=env_val):
+                _set_or_unset("DD_PROFILE", env_val)
+                assert dirs.get_profile() == expected
 
-    def tearDown(self) -> None:
-        if self.original is not None:
-            os.environ["DD_PROFILE"] = self.original
-        elif "DD_PROFILE" in os.environ:
-            del os.environ["DD_PROFILE"]
 
-    def test_uses_env_when_set(self) -> None:
-        os.environ["DD_PROFILE"] = "myprofile"
-        assert dirs.get_profile() == "myprofile"
+class TestDefaultDataPath(_EnvRestoringTestCase):
+    fake_home: Path
 
-    def test_falls_back_when_env_unset(self) -> None:
-        if "DD_PROFILE" in os.environ:
-            del os.environ["DD_PROFILE"]
-        assert dirs.get_profile() == "default"
+    @classmethod
+    def setUpClass(cls) -> None:
+        # パスを組み立てるだけでファイルは作らないので、fake home はクラスで共有する
+        cls.fake_home = Path(cls.enterClassContext(tempfile.TemporaryDirectory()))
 
+    def test_with_and_without_profile(self) -> None:
+        home = self.fake_home / ".dandori"
+        for profile, expected in ((None, home / "tasks.yaml"), ("dev", home / "dev" / "tasks.yaml")):
+            with self.subTest(profile=profile):
+                _set_or_unset("DD_PROFILE", profile)
+                with mock.patch("pathlib.Path.home", return_value=self.fake_home):
+                    assert dirs.default_data_path() == expected
 
-class TestDefaultDataPath(unittest.TestCase):
-    def setUp(self) -> None:
-        self.original = os.environ.get("DD_PROFILE")
-        self.fake_home = Path(tempfile.mkdtemp())
 
-    def tearDown(self) -> None:
-        if self.original is not None:
-            os.environ["DD_PROFILE"] = self.original
-        elif "DD_PROFILE" in os.environ:
-            del os.environ["DD_PROFILE"]
-        with contextlib.suppress(OSError):
-            self.fake_home.rmdir()
-
-    def test_without_profile(self) -> None:
-        if "DD_PROFILE" in os.environ:
-            del os.environ["DD_PROFILE"]
-        with mock.patch("pathlib.Path.home", return_value=self.fake_home):
-            p = dirs.default_data_path()
-        assert p == self.fake_home / ".dandori" / "tasks.yaml"
-
-    def test_with_profile(self) -> None:
-        os.environ["DD_PROFILE"] = "dev"
-        with mock.patch("pathlib.Path.home", return_value=self.fake_home):
-            p = dirs.default_data_path()
-        assert p == self.fake_home / ".dandori" / "dev" / "tasks.yaml"
-
-
-class TestGetDataPath(unittest.TestCase):
+class TestGetDataPath(_EnvRestoringTestCase):
     def setUp(self) -> None:
+        super().setUp()
         self.temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".yaml")  # noqa: SIM115
         self.temp_file.close()
-        self.original_data = os.environ.get("DD_DATA_PATH")
-        self.original_profile = os.environ.get("DD_PROFILE")
 
     def tearDown(self) -> None:
         Path(self.temp_file.name).unlink(missing_ok=True)
-        if self.original_data is not None:
-            os.environ["DD_DATA_PATH"] = self.original_data
-        elif "DD_DATA_PATH" in os.environ:
-            del os.environ["DD_DATA_PATH"]
-        if self.original_profile is not None:
-            os.environ["DD_PROFILE"] = self.original_profile
-        elif "DD_PROFILE" in os.environ:
-            del os.environ["DD_PROFILE"]
 
     def test_uses_env_existing_file(self) -> None:
         os.environ["DD_DATA_PATH"] = self.temp_file.name
@@ -138,8 +125,7 @@ class TestGetDataPath(unittest.TestCase):
                 Path(tmpdir).rmdir()
 
     def test_uses_default_when_env_unset(self) -> None:
-        if "DD_DATA_PATH" in os.environ:
-            del os.environ["DD_DATA_PATH"]
+        os.environ.pop("DD_DATA_PATH", None)
         fake_home = Path(tempfile.mkdtemp())
         expected = fake_home / ".dandori" / "tasks.yaml"
         expected.parent.mkdir(parents=True, exist_ok=True)
@@ -157,50 +143,31 @@ class TestGetDataPath(unittest.TestCase):
                 pass
 
 
-class TestDefaultArchivePath(unittest.TestCase):
-    def setUp(self) -> None:
-        self.original = os.environ.get("DD_PROFILE")
-        self.fake_home = Path(tempfile.mkdtemp())
+class TestDefaultArchivePath(_EnvRestoringTestCase):
+    fake_home: Path
 
-    def tearDown(self) -> None:
-        if self.original is not None:
-            os.environ["DD_PROFILE"] = self.original
-        elif "DD_PROFILE" in os.environ:
-            del os.environ["DD_PROFILE"]
-        with contextlib.suppress(OSError):
-            self.fake_home.rmdir()
-
-    def test_without_profile(self) -> None:
-        if "DD_PROFILE" in os.environ:
-            del os.environ["DD_PROFILE"]
-        with mock.patch("pathlib.Path.home", return_value=self.fake_home):
-            p = dirs.default_archive_path()
-        assert p == self.fake_home / ".dandori" / "archive.yaml"
-
-    def test_with_profile(self) -> None:
-        os.environ["DD_PROFILE"] = "dev"
-        with mock.patch("pathlib.Path.home", return_value=self.fake_home):
-            p = dirs.default_archive_path()
-        assert p == self.fake_home / ".dandori" / "dev" / "archive.yaml"
-
-
-class TestGetArchivePath(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # パスを組み立てるだけでファイルは作らないので、fake home はクラスで共有する
+        cls.fake_home = Path(cls.enterClassContext(tempfile.TemporaryDirectory()))
+
+    def test_with_and_without_profile(self) -> None:
+        home = self.fake_home / ".dandori"
+        for profile, expected in ((None, home / "archive.yaml"), ("dev", home / "dev" / "archive.yaml")):
+            with self.subTest(profile=profile):
+                _set_or_unset("DD_PROFILE", profile)
+                with mock.patch("pathlib.Path.home", return_value=self.fake_home):
+                    assert dirs.default_archive_path() == expected
+
+
+class TestGetArchivePath(_EnvRestoringTestCase):
     def setUp(self) -> None:
+        super().setUp()
         self.temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".yaml")  # noqa: SIM115
         self.temp_file.close()
-        self.original_archive = os.environ.get("DD_ARCHIVE_PATH")
-        self.original_profile = os.environ.get("DD_PROFILE")
 
     def tearDown(self) -> None:
         Path(self.temp_file.name).unlink(missing_ok=True)
-        if self.original_archive is not None:
-            os.environ["DD_ARCHIVE_PATH"] = self.original_archive
-        elif "DD_ARCHIVE_PATH" in os.environ:
-            del os.environ["DD_ARCHIVE_PATH"]
-        if self.original_profile is not None:
-            os.environ["DD_PROFILE"] = self.original_profile
-        elif "DD_PROFILE" in os.environ:
-            del os.environ["DD_PROFILE"]
 
     def test_uses_env_existing_file(self) -> None:
         os.environ["DD_ARCHIVE_PATH"] = self.temp_file.name
@@ -228,8 +195,7 @@ class TestGetArchivePath(unittest.TestCase):
                 Path(tmpdir).rmdir()
 
     def test_uses_default_when_env_unset(self) -> None:
-        if "DD_ARCHIVE_PATH" in os.environ:
-            del os.environ["DD_ARCHIVE_PATH"]
+        os.environ.pop("DD_ARCHIVE_PATH", None)
         fake_home = Path(tempfile.mkdtemp())
         expected = fake_home / ".dandori" / "archive.yaml"
         expected.parent.mkdir(parents=True, exist_ok=True)
@@ -279,19 +245,32 @@ class TestDefaultHomeDir(unittest.TestCase):
             except OSError:
                 pass
 
+    def test_mkdir_only_once_per_path(self) -> None:
+        fake_home = Path(tempfile.mkdtemp())
+        try:
+            with mock.patch("pathlib.Path.home", return_value=fake_home):
+                dirs.default_home_dir()
+                with mock.patch("pathlib.Path.mkdir") as mkdir:
+                    dirs.default_home_dir()
+                mkdir.assert_not_called()
+        finally:
+            try:
+                (fake_home / ".dandori").rmdir()
+                fake_home.rmdir()
+            except OSError:
+                pass
+
 
 class TestLoadConfig(unittest.TestCase):
-    def setUp(self) -> None:
-        self.fake_home = Path(tempfile.mkdtemp())
+    fake_home: Path
 
-    def tearDown(self) -> None:
-        try:
-            for f in (self.fake_home / ".dandori").iterdir():
-                f.unlink(missing_ok=True)
-            (self.fake_home / ".dandori").rmdir()
-            self.fake_home.rmdir()
-        except OSError:
-            pass
+    @classmethod
+    def setUpClass(cls) -> None:
+        # fake home はクラスで共有し、テストごとには config.env だけを消す
+        cls.fake_home = Path(cls.enterClassContext(tempfile.TemporaryDirectory()))
+
+    def setUp(self) -> None:
+        (self.fake_home / ".dandori" / "config.env").unlink(missing_ok=True)
 
     def test_returns_empty_when_no_config(self) -> None:
         with mock.patch("dandori.util.dirs.default_home_dir", return_value=self.fake_home / ".dandori"):
@@ -315,31 +294,57 @@ class TestLoadConfig(unittest.TestCase):
             cfg = dirs.load_config()
         assert cfg == {"A": "1", "B": "2"}
 
+    def test_strips_spaces_around_key_and_value(self) -> None:
+        (self.fake_home / ".dandori").mkdir(parents=True, exist_ok=True)
+        env_path = self.fake_home / ".dandori" / "config.env"
+        env_path.write_text("A = 1\nURL=http://x?a=b\nno_separator\n", encoding="utf-8")
+        with mock.patch("dandori.util.dirs.default_home_dir", return_value=self.fake_home / ".dandori"):
+            cfg = dirs.load_config()
+        assert cfg == {"A": "1", "URL": "http://x?a=b"}
+
+    def test_skips_comment_lines(self) -> None:
+        (self.fake_home / ".dandori").mkdir(parents=True, exist_ok=True)
+        env_path = self.fake_home / ".dandori" / "config.env"
+        env_path.write_text("# A=0\n  #B=0\nA=1\n", encoding="utf-8")
+        with mock.patch("dandori.util.dirs.default_home_dir", return_value=self.fake_home / ".dandori"):
+            cfg = dirs.load_config()
+        assert cfg == {"A": "1"}
+
+    def test_reloads_when_config_changes(self) -> None:
+        (self.fake_home / ".dandori").mkdir(parents=True, exist_ok=True)
+        env_path = self.fake_home / ".dandori" / "config.env"
+        env_path.write_text("A=1\n", encoding="utf-8")
+        with mock.patch("dandori.util.dirs.default_home_dir", return_value=self.fake_home / ".dandori"):
+            cfg = dirs.load_config()
+            cfg["A"] = "mutated"
+            assert dirs.load_config() == {"A": "1"}
+            env_path.write_text("A=1\nB=2\n", encoding="utf-8")
+            assert dirs.load_config() == {"A": "1", "B": "2"}
+
+    def test_unchanged_config_is_read_once(self) -> None:
+        (self.fake_home / ".dandori").mkdir(parents=True, exist_ok=True)
+        env_path = self.fake_home / ".dandori" / "config.env"
+        env_path.write_text("A=1\nB=2\n", encoding="utf-8")
+        with (
+            mock.patch("dandori.util.dirs.default_home_dir", return_value=self.fake_home / ".dandori"),
+            mock.patch.object(Path, "read_text", autospec=True, side_effect=Path.read_text) as read_text,
+        ):
+            assert dirs.load_config() == {"A": "1", "B": "2"}
+            assert dirs.load_config() == {"A": "1", "B": "2"}
+        read_text.assert_called_once()
+
 
-class TestLoadEnv(unittest.TestCase):
+class TestLoadEnv(_EnvRestoringTestCase):
     def setUp(self) -> None:
+        super().setUp()
         self.temp_data = tempfile.NamedTemporaryFile(delete=False, suffix=".yaml")  # noqa: SIM115
         self.temp_archive = tempfile.NamedTemporaryFile(delete=False, suffix=".yaml")  # noqa: SIM115
         self.temp_data.close()
         self.temp_archive.close()
-        self.orig_data = os.environ.get("DD_DATA_PATH")
-        self.orig_archive = os.environ.get("DD_ARCHIVE_PATH")
-        self.orig_username = os.environ.get("DD_USERNAME")
-        self.orig_profile = os.environ.get("DD_PROFILE")
 
     def tearDown(self) -> None:
         Path(self.temp_data.name).unlink(missing_ok=True)
         Path(self.temp_archive.name).unlink(missing_ok=True)
-        for key, val in [
-            ("DD_DATA_PATH", self.orig_data),
-            ("DD_ARCHIVE_PATH", self.orig_archive),
-            ("DD_USERNAME", self.orig_username),
-            ("DD_PROFILE", self.orig_profile),
-        ]:
-            if val is not None:
-                os.environ[key] = val
-            elif key in os.environ:
-                del os.environ[key]
 
     def test_returns_username_profile_data_archive_paths(self) -> None:
         os.environ["DD_DATA_PATH"] = self.temp_data.name
@@ -1,16 +1,23 @@
 import re
 import unittest
+import uuid
+from unittest import mock
 
 import pytest
 
 from dandori.util.ids import (
+    IdIndex,
     gen_task_id,
+    gen_task_ids,
     parse_id,
     parse_id_with_msg,
     parse_ids,
     parse_ids_with_msg,
 )
 
+_UUID_RE = re.compile(r"^[0-9a-f-]{36}$")
+_UNKNOWN_X_RE = re.compile(r"Unknown ID: x \(please set correct ID.\)")
+
 
 class TestGenTaskId(unittest.TestCase):
     def test_format(self) -> None:
@@ -20,11 +27,28 @@ class TestGenTaskId(unittest.TestCase):
         assert len(parts) == 3
         uuid_part, ts, username = parts
         assert len(uuid_part) == 36
-        assert re.match(r"[0-9a-f-]{36}", uuid_part)
+        assert _UUID_RE.match(uuid_part)
         assert len(ts) == 14
         assert ts.isdigit()
         assert username == "alice"
 
+    def test_uuid_part_is_v4(self) -> None:
+        u = uuid.UUID(gen_task_id("alice").split("_")[0])
+        assert u.version == 4
+        assert u.variant == uuid.RFC_4122
+
+
+class TestGenTaskIds(unittest.TestCase):
+    def test_batch_unique_and_same_format(self) -> None:
+        out = gen_task_ids("bob", 5)
+        assert len(out) == 5
+        assert len(set(out)) == 5
+        assert {tid.split("_")[1] for tid in out} == {out[0].split("_")[1]}
+        assert all(tid.endswith("_bob") for tid in out)
+
+    def test_zero(self) -> None:
+        assert gen_task_ids("bob", 0) == []
+
 
 class TestParseId(unittest.TestCase):
     def test_empty(self) -> None:
@@ -53,17 +77,50 @@ class TestParseId(unittest.TestCase):
         assert "Unknown" in r.unwrap_err()
 
 
+class TestIdIndex(unittest.TestCase):
+    def test_exact_beats_prefix(self) -> None:
+        idx = IdIndex(["ab", "abc", "abd"])
+        assert parse_id("ab", source_ids=idx).unwrap() == "ab"
+
+    def test_prefix_single_and_ambiguous(self) -> None:
+        idx = IdIndex(["abc", "abd", "xyz"])
+        assert parse_id("x", source_ids=idx).unwrap() == "xyz"
+        assert "Ambiguous" in parse_id("ab", source_ids=idx).unwrap_err()
+        assert "Unknown" in parse_id("b", source_ids=idx).unwrap_err()
+
+    def test_parse_ids_with_index(self) -> None:
+        idx = IdIndex(["a1", "b1", "c1"])
+        assert parse_ids("a, b", source_ids=idx).unwrap() == ["a1", "b1"]
+
+
 class TestParseIds(unittest.TestCase):
     def test_multiple_ok(self) -> None:
         r = parse_ids("a,b,c", source_ids=["a", "b", "c"])
         assert r.is_ok()
         assert r.unwrap() == ["a", "b", "c"]
 
+    def test_ambiguous_and_empty_tokens(self) -> None:
+        r = parse_ids("a1,b", source_ids=["a1", "b1", "b2"])
+        assert "Ambiguous ID: b" in r.unwrap_err()
+        r = parse_ids("a1,,b1", source_ids=["a1", "b1"])
+        assert r.unwrap_err() == "Empty ID"
+
     def test_one_err_returns_err(self) -> None:
         r = parse_ids("a,x,c", source_ids=["a", "b", "c"])
         assert r.is_err()
         assert "Unknown" in r.unwrap_err()
 
+    def test_single_token_skips_index(self) -> None:
+        with mock.patch.object(IdIndex, "__init__", autospec=True, side_effect=IdIndex.__init__) as index:
+            assert parse_ids(" b1 ", source_ids=["a1", "b1"]).unwrap() == ["b1"]
+            assert "Ambiguous" in parse_ids("a", source_ids=["a1", "a2"]).unwrap_err()
+            assert parse_ids("", source_ids=["a1"]).unwrap_err() == "Empty ID"
+        index.assert_not_called()
+        # 複数トークンならインデックスを1回だけ作る
+        with mock.patch.object(IdIndex, "__init__", autospec=True, side_effect=IdIndex.__init__) as index:
+            assert parse_ids("a1,b1", source_ids=["a1", "b1"]).unwrap() == ["a1", "b1"]
+        index.assert_called_once()
+
 
 class TestParseIdWithMsg(unittest.TestCase):
     def test_none_returns_empty(self) -> None:
@@ -73,10 +130,7 @@ class TestParseIdWithMsg(unittest.TestCase):
         assert parse_id_with_msg("a", source_ids=["a"]) == "a"
 
     def test_err_can_raise_true_raises(self) -> None:
-        with pytest.raises(
-            ValueError,
-            match=r"Unknown ID: x \(please set correct ID.\)",
-        ) as ctx:
+        with pytest.raises(ValueError, match=_UNKNOWN_X_RE) as ctx:
             parse_id_with_msg("x", source_ids=["a"], can_raise=True)
         assert "Unknown" in str(ctx.value)
 
@@ -92,10 +146,7 @@ class TestParseIdsWithMsg(unittest.TestCase):
         assert parse_ids_with_msg("a,b", source_ids=["a", "b"]) == ["a", "b"]
 
     def test_err_can_raise_true_raises(self) -> None:
-        with pytest.raises(
-            ValueError,
-            match=r"Unknown ID: x \(please set correct ID.\)",
-        ) as ctx:
+        with pytest.raises(ValueError, match=_UNKNOWN_X_RE) as ctx:
             parse_ids_with_msg("a,x", source_ids=["a", "b"], can_raise=True)
         assert "Unknown" in str(ctx.value)
 
@@ -2,6 +2,7 @@ import os
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 import pytest
 
@@ -32,22 +33,21 @@ def test_import_json_file_not_found_raises() -> None:
 class TestImportExport(unittest.TestCase):
     """export / import で同一内容に戻ることのテスト"""
 
+    data_path: str
+    store: StoreToYAML
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """一時ディレクトリとストアはクラスで1つだけ作り、ディレクトリは最後にまとめて削除する"""
+        cls.enterClassContext(mock.patch.dict(os.environ, {"DD_USERNAME": "test_user"}))
+        tmp_dir = Path(cls.enterClassContext(tempfile.TemporaryDirectory()))
+        cls.data_path = str(tmp_dir / "tasks.yaml")
+        cls.store = StoreToYAML(data_path=cls.data_path)
+
     def setUp(self) -> None:
-        """各テストの前に一時ファイルを作成"""
-        self.original_username = os.environ.get("DD_USERNAME")
-        os.environ["DD_USERNAME"] = "test_user"
-        self.temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".yaml")  # noqa: SIM115
-        self.temp_file.close()
-        self.store = StoreToYAML(data_path=self.temp_file.name)
-        self.store.load()
-
-    def tearDown(self) -> None:
-        """各テストの後に一時ファイルを削除"""
-        Path(self.temp_file.name).unlink(missing_ok=True)
-        if self.original_username is not None:
-            os.environ["DD_USERNAME"] = self.original_username
-        elif "DD_USERNAME" in os.environ:
-            del os.environ["DD_USERNAME"]
+        """前のテストが残したタスクを捨て、空のストアから始める"""
+        self.store.tasks = {}
+        self.store.commit()
 
     def test_export_import_preserves_content(self) -> None:
         """Export / import で同一内容に戻ることを確認"""
@@ -72,12 +72,11 @@ class TestImportExport(unittest.TestCase):
             export_json(all_tasks_result.unwrap(), export_file)
 
             # 新しいストアを作成してインポート
-            new_store = StoreToYAML(data_path=self.temp_file.name + ".new")
+            new_store = StoreToYAML(data_path=self.data_path + ".new")
             new_store.load()
             imported_tasks = import_json(export_file)
 
-            for tid, task in imported_tasks.items():
-                new_store.add_task(task, id_overwritten=tid)
+            assert new_store.add_tasks(list(imported_tasks.values())).is_ok()
             new_store.save()
 
             # 元のタスクとインポートしたタスクを比較
@@ -114,7 +113,7 @@ class TestImportExport(unittest.TestCase):
 
         finally:
             Path(export_file).unlink(missing_ok=True)
-            Path(self.temp_file.name + ".new").unlink(missing_ok=True)
+            Path(self.data_path + ".new").unlink(missing_ok=True)
 
     def test_export_import_preserves_archived_status(self) -> None:
         """アーカイブ状態も保持されることを確認"""
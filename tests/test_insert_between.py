@@ -2,6 +2,7 @@ import os
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 from dandori.core.models import Task
 from dandori.storage.yaml_store import StoreToYAML
@@ -10,23 +11,19 @@ from dandori.storage.yaml_store import StoreToYAML
 class TestInsertBetween(unittest.TestCase):
     """insert_between で A→C→B になることのテスト"""
 
+    tmp_dir: Path
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """一時ディレクトリはクラスで1つ作り、最後にまとめて削除する"""
+        cls.enterClassContext(mock.patch.dict(os.environ, {"DD_USERNAME": "test_user"}))
+        cls.tmp_dir = Path(cls.enterClassContext(tempfile.TemporaryDirectory()))
+
     def setUp(self) -> None:
-        """各テストの前に一時ファイルを作成"""
-        self.original_username = os.environ.get("DD_USERNAME")
-        os.environ["DD_USERNAME"] = "test_user"
-        self.temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".yaml")  # noqa: SIM115
-        self.temp_file.close()
-        self.store = StoreToYAML(data_path=self.temp_file.name)
+        """テストごとに別名のデータファイルを使う (ファイルが無ければ空のストアとして読み込まれる)"""
+        self.store = StoreToYAML(data_path=str(self.tmp_dir / f"{self._testMethodName}.yaml"))
         self.store.load()
 
-    def tearDown(self) -> None:
-        """各テストの後に一時ファイルを削除"""
-        Path(self.temp_file.name).unlink(missing_ok=True)
-        if self.original_username is not None:
-            os.environ["DD_USERNAME"] = self.original_username
-        elif "DD_USERNAME" in os.environ:
-            del os.environ["DD_USERNAME"]
-
     def test_insert_between_creates_a_to_c_to_b(self) -> None:
         """insert_between で A→C→B の構造ができることを確認"""
         # AとBのタスクを作成
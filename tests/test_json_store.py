@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+from collections import OrderedDict
+from pathlib import Path
+from unittest import mock
+
+from dandori.core.models import Task
+from dandori.storage import yaml_store
+from dandori.storage.json_store import StoreToJSON
+
+
+class TestJSONStore(unittest.TestCase):
+    """StoreToJSON の読み書きのテスト"""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.enterClassContext(mock.patch.dict(os.environ, {"DD_USERNAME": "test_user"}))
+
+    def setUp(self) -> None:
+        self.temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".json")  # noqa: SIM115
+        self.temp_file.close()
+        self.store = StoreToJSON(data_path=self.temp_file.name)
+        self.store.load()
+
+    def tearDown(self) -> None:
+        Path(self.temp_file.name).unlink(missing_ok=True)
+
+    def test_load_empty_file(self) -> None:
+        assert self.store.tasks == {}
+
+    def test_save_and_reload(self) -> None:
+        self.store.add_task(Task(id="ja", title="タスクA", owner="test_user"))
+        self.store.add_task(Task(id="jb", title="タスクB", owner="test_user"))
+        self.store.link_tasks("ja", "jb")
+        self.store.save()
+
+        reloaded = StoreToJSON(data_path=self.temp_file.name)
+        reloaded.load()
+        assert set(reloaded.tasks) == {"ja", "jb"}
+        assert reloaded.get_task("ja").unwrap().title == "タスクA"
+        assert reloaded.get_task("ja").unwrap().children == ["jb"]
+        assert reloaded.get_task("jb").unwrap().depends_on == ["ja"]
+
+    def test_save_and_reload_metadata_outside_orjson_range(self) -> None:
+        """インストール済みの orjson が扱えない値 (64bit を超える整数) を含むメタデータも保存・再読み込みできる"""
+        self.store.add_task(Task(id="ja", title="タスクA", owner="test_user", metadata={"big": 2**70}))
+        self.store.commit()
+        self.store.save()
+
+        # 読み込みキャッシュを空にして、ファイルを実際にパースさせる
+        with mock.patch.object(yaml_store, "_load_cache", OrderedDict()):
+            reloaded = StoreToJSON(data_path=self.temp_file.name)
+            reloaded.load()
+        assert reloaded.get_task("ja").unwrap().metadata == {"big": 2**70}
+
+    def test_load_broken_file(self) -> None:
+        Path(self.temp_file.name).write_text("{broken", encoding="utf-8")
+        self.store.load()
+        assert self.store.tasks == {}
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,13 @@
 import json
+import math
 import unittest
+from datetime import UTC, datetime
 from typing import Any
+from unittest import mock
 
 import yaml  # type: ignore[import-untyped]
 
+from dandori.util import meta_parser
 from dandori.util.meta_parser import (
     deserialize,
     deserialize_by_json,
@@ -13,6 +17,10 @@ from dandori.util.meta_parser import (
     serialize_by_yaml,
 )
 
+# 期待値はパーサーを通さず、定数として1回だけ用意する
+EXPECTED_SIMPLE = {"key": "value", "number": 42}
+EXPECTED_NESTED = {"key": {"nested": "value"}, "list": [1, 2, 3]}
+
 
 class TestMetaParser(unittest.TestCase):
     """meta_parser モジュールのテスト"""
@@ -25,7 +33,7 @@ class TestMetaParser(unittest.TestCase):
         result = serialize_by_json(metadata)
         assert result.is_ok()
         data = result.unwrap()
-        assert data == {"key": "value", "number": 42}
+        assert data == EXPECTED_SIMPLE
 
     def test_serialize_by_json_invalid(self) -> None:
         """無効なJSON文字列はエラーを返す"""
@@ -51,7 +59,7 @@ class TestMetaParser(unittest.TestCase):
         assert result.is_ok()
         data = result.unwrap()
         parsed = json.loads(data)
-        assert parsed == {"key": "value", "number": 42}
+        assert parsed == EXPECTED_SIMPLE
 
     def test_deserialize_by_json_empty(self) -> None:
         """空のdictをJSON文字列に変換できる"""
@@ -69,7 +77,31 @@ class TestMetaParser(unittest.TestCase):
         assert result.is_ok()
         data = result.unwrap()
         parsed = json.loads(data)
-        assert parsed == {"key": {"nested": "value"}, "list": [1, 2, 3]}
+        assert parsed == EXPECTED_NESTED
+
+    def test_json_same_result_with_and_without_orjson(self) -> None:
+        """インストール済みの orjson の有無にかかわらず、JSON の変換結果は標準の json と同じになる"""
+        dumped: list[tuple[dict[Any, Any], str]] = [
+            ({1: "a"}, '{"1": "a"}'),
+            ({"big": 2**70}, '{"big": 1180591620717411303424}'),
+            ({"nan": float("nan"), "inf": float("inf")}, '{"nan": NaN, "inf": Infinity}'),
+            ({"f": 1e16, "g": 1e-7, "none": None}, '{"f": 1e+16, "g": 1e-07, "none": null}'),
+            ({"k": "日本語", "l": [1, 2]}, '{"k": "\\u65e5\\u672c\\u8a9e", "l": [1, 2]}'),
+        ]
+        for data, expected in dumped:
+            assert deserialize_by_json(data).unwrap() == expected
+        assert deserialize_by_json({"t": datetime.now(UTC)}).is_err()
+
+        impls = {
+            "installed": meta_parser._json_loads,  # noqa: SLF001
+            "stdlib": meta_parser._std_json_loads,  # noqa: SLF001
+        }
+        for name, loads in impls.items():
+            with self.subTest(impl=name), mock.patch.object(meta_parser, "_json_loads", loads):
+                assert serialize_by_json('{"big": 1180591620717411303424}').unwrap() == {"big": 2**70}
+                assert math.isnan(serialize_by_json('{"nan": NaN}').unwrap()["nan"])
+                assert serialize_by_json('{"k": "\\u65e5\\u672c\\u8a9e"}').unwrap() == {"k": "日本語"}
+                assert "Invalid JSON" in serialize_by_json('{"key": ').unwrap_err()
 
     # ---- serialize_by_yaml ----
 
@@ -79,7 +111,7 @@ class TestMetaParser(unittest.TestCase):
         result = serialize_by_yaml(metadata)
         assert result.is_ok()
         data = result.unwrap()
-        assert data == {"key": "value", "number": 42}
+        assert data == EXPECTED_SIMPLE
 
     def test_serialize_by_yaml_invalid(self) -> None:
         """無効なYAML文字列はエラーを返す"""
@@ -101,7 +133,18 @@ class TestMetaParser(unittest.TestCase):
         result = serialize_by_yaml(metadata)
         assert result.is_ok()
         data = result.unwrap()
-        assert data == {"key": {"nested": "value"}, "list": [1, 2, 3]}
+        assert data == EXPECTED_NESTED
+
+    def test_serialize_by_yaml_cached_result_is_not_shared(self) -> None:
+        """同じ文字列の2回目以降はキャッシュから返すが、呼び出し側の変更はキャッシュに影響しない"""
+        metadata = "key:\n  nested: value\nlist: [1, 2]"
+        first = serialize_by_yaml(metadata).unwrap()
+        first["key"]["nested"] = "mutated"
+        first["list"].append(3)
+        with mock.patch("dandori.util.meta_parser.yaml.load") as load:
+            second = serialize_by_yaml(metadata).unwrap()
+        load.assert_not_called()
+        assert second == {"key": {"nested": "value"}, "list": [1, 2]}
 
     # ---- deserialize_by_yaml ----
 
@@ -112,7 +155,7 @@ class TestMetaParser(unittest.TestCase):
         assert result.is_ok()
         data = result.unwrap()
         parsed = yaml.safe_load(data)
-        assert parsed == {"key": "value", "number": 42}
+        assert parsed == EXPECTED_SIMPLE
 
     def test_deserialize_by_yaml_empty(self) -> None:
         """空のdictをYAML文字列に変換できる"""
@@ -130,7 +173,33 @@ class TestMetaParser(unittest.TestCase):
         assert result.is_ok()
         data = result.unwrap()
         parsed = yaml.safe_load(data)
-        assert parsed == {"key": {"nested": "value"}, "list": [1, 2, 3]}
+        assert parsed == EXPECTED_NESTED
+
+    def test_deserialize_by_yaml_reuses_output_for_same_content(self) -> None:
+        """キー順だけが違う dict には同じ出力を使い回し、yaml.dump を呼ばない"""
+        first = deserialize_by_yaml({"b": [1, 2], "a": {"x": "y"}}).unwrap()
+        with (
+            mock.patch("dandori.util.meta_parser.yaml.dump") as dump,
+            mock.patch("dandori.util.meta_parser.json.loads") as loads,
+        ):
+            second = deserialize_by_yaml({"a": {"x": "y"}, "b": [1, 2]}).unwrap()
+        dump.assert_not_called()
+        loads.assert_not_called()
+        assert second == first
+
+    def test_deserialize_by_yaml_keeps_non_json_types(self) -> None:
+        """JSON にすると同じになる int のキーと str のキーの出力は取り違えない"""
+        metadata: dict[Any, Any] = {1: "one"}
+        assert yaml.safe_load(deserialize_by_yaml({"1": "one"}).unwrap()) == {"1": "one"}
+        assert yaml.safe_load(deserialize_by_yaml(metadata).unwrap()) == {1: "one"}
+
+    def test_deserialize_by_yaml_cache_ignores_later_mutation(self) -> None:
+        """出力を使い回した後に呼び出し側が dict を書き換えても、古い出力は返さない"""
+        metadata = {"key": ["a"]}
+        first = deserialize_by_yaml(metadata).unwrap()
+        metadata["key"].append("b")
+        assert yaml.safe_load(deserialize_by_yaml(metadata).unwrap()) == {"key": ["a", "b"]}
+        assert deserialize_by_yaml({"key": ["a"]}).unwrap() == first
 
     # ---- serialize (自動判定) ----
 
@@ -160,6 +229,19 @@ class TestMetaParser(unittest.TestCase):
         data = result.unwrap()
         assert data == {"key": "value"}
 
+    def test_serialize_auto_skips_json_for_non_json_start(self) -> None:
+        """先頭文字が JSON になりえない場合は JSON のパースを試さない"""
+        with mock.patch("dandori.util.meta_parser.serialize_by_json") as by_json:
+            result = serialize("key: value")
+        by_json.assert_not_called()
+        assert result.unwrap() == {"key": "value"}
+
+    def test_serialize_auto_json_scalar_still_prefers_json(self) -> None:
+        """YAML と解釈の異なる JSON のスカラーは従来どおり JSON として扱う"""
+        # 型注釈は dict だが、JSON のスカラーはそのまま返る
+        value: object = serialize("1e3").unwrap()
+        assert value == 1000.0
+
     def test_serialize_auto_invalid(self) -> None:
         """無効な文字列はエラーを返す"""
         metadata = "{invalid: [unclosed-list"
@@ -230,6 +312,13 @@ class TestMetaParser(unittest.TestCase):
         # dictは常にシリアライズ可能なので、is_ok()になるはず
         assert result.is_ok()
 
+    def test_deserialize_auto_skips_yaml_when_json_ok(self) -> None:
+        """JSONで変換できた場合はYAMLへの変換を行わない"""
+        with mock.patch("dandori.util.meta_parser.deserialize_by_yaml") as by_yaml:
+            result = deserialize({"key": "value"})
+        assert result.is_ok()
+        by_yaml.assert_not_called()
+
     def test_deserialize_with_json_parser(self) -> None:
         """JSONパーサーを指定して変換できる"""
         metadata = {"key": "value", "number": 42}
@@ -237,7 +326,7 @@ class TestMetaParser(unittest.TestCase):
         assert result.is_ok()
         data = result.unwrap()
         parsed = json.loads(data)
-        assert parsed == {"key": "value", "number": 42}
+        assert parsed == EXPECTED_SIMPLE
 
     def test_deserialize_with_yaml_parser(self) -> None:
         """YAMLパーサーを指定して変換できる"""
@@ -246,7 +335,7 @@ class TestMetaParser(unittest.TestCase):
         assert result.is_ok()
         data = result.unwrap()
         parsed = yaml.safe_load(data)
-        assert parsed == {"key": "value", "number": 42}
+        assert parsed == EXPECTED_SIMPLE
 
     def test_deserialize_roundtrip_json(self) -> None:
         """JSONの往復変換が正しく動作する"""
@@ -260,9 +349,7 @@ class TestMetaParser(unittest.TestCase):
         assert str_result.is_ok()
         restored = str_result.unwrap()
         # 元の文字列と比較 (JSONのフォーマットは異なる可能性があるため、パースして比較)
-        original_parsed = json.loads(original)
-        restored_parsed = json.loads(restored)
-        assert original_parsed == restored_parsed
+        assert json.loads(restored) == EXPECTED_SIMPLE
 
     def test_deserialize_roundtrip_yaml(self) -> None:
         """YAMLの往復変換が正しく動作する"""
@@ -276,9 +363,7 @@ class TestMetaParser(unittest.TestCase):
         assert str_result.is_ok()
         restored = str_result.unwrap()
         # 元の文字列と比較 (YAMLのフォーマットは異なる可能性があるため、パースして比較)
-        original_parsed = yaml.safe_load(original)
-        restored_parsed = yaml.safe_load(restored)
-        assert original_parsed == restored_parsed
+        assert yaml.safe_load(restored) == EXPECTED_SIMPLE
 
 
 if __name__ == "__main__":
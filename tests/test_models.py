@@ -1,4 +1,6 @@
+import copy
 import unittest
+from dataclasses import asdict
 
 from dandori.core.models import Task
 
@@ -19,5 +21,46 @@ class TestTaskFromDict(unittest.TestCase):
         assert "temporary" in t.title or t.title
 
 
+class TestTaskSlots(unittest.TestCase):
+    def test_no_instance_dict(self) -> None:
+        t = Task(id="s1", owner="u", title="T")
+        assert not hasattr(t, "__dict__")
+        assert Task.from_dict(t.to_dict()) == t
+
+
+class TestTaskCopy(unittest.TestCase):
+    def _task(self) -> Task:
+        return Task(
+            id="c1",
+            owner="u",
+            title="T",
+            depends_on=["p"],
+            children=["c"],
+            tags=["x"],
+            metadata={"nested": {"k": [1, 2]}},
+        )
+
+    def test_to_dict_matches_asdict(self) -> None:
+        t = self._task()
+        assert t.to_dict() == asdict(t)
+
+    def test_to_dict_does_not_share_containers(self) -> None:
+        t = self._task()
+        d = t.to_dict()
+        d["children"].append("other")
+        d["metadata"]["nested"]["k"].append(3)
+        assert t.children == ["c"]
+        assert t.metadata == {"nested": {"k": [1, 2]}}
+
+    def test_deepcopy_and_copy(self) -> None:
+        t = self._task()
+        deep = copy.deepcopy(t)
+        assert deep == t
+        assert deep.children is not t.children
+        shallow = copy.copy(t)
+        assert shallow == t
+        assert shallow.children is t.children
+
+
 if __name__ == "__main__":
     unittest.main()
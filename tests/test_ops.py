@@ -3,10 +3,12 @@ import tempfile
 import unittest
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from unittest import mock
 
 import pytest
 
 from dandori.core import ops
+from dandori.storage import get_store
 
 JST = timezone(timedelta(hours=9))
 
@@ -14,26 +16,21 @@ JST = timezone(timedelta(hours=9))
 class TestOps(unittest.TestCase):
     """ops モジュールのユースケース関数のテスト"""
 
+    data_path: Path
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """一時ディレクトリと環境変数はクラスで1回だけ用意し、クラスの最後にまとめて戻す"""
+        tmp_dir = Path(cls.enterClassContext(tempfile.TemporaryDirectory()))
+        # ops の挙動は保存形式に依らないので、パースの軽い JSON ストアで回す
+        cls.data_path = tmp_dir / "tasks.json"
+        cls.enterClassContext(
+            mock.patch.dict(os.environ, {"DD_DATA_PATH": str(cls.data_path), "DD_USERNAME": "test_user"}),
+        )
+
     def setUp(self) -> None:
-        """各テストの前に一時ファイルを作成し、環境変数を設定"""
-        self.temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".yaml")  # noqa: SIM115
-        self.temp_file.close()
-        self.original_data_path = os.environ.get("DD_DATA_PATH")
-        self.original_username = os.environ.get("DD_USERNAME")
-        os.environ["DD_DATA_PATH"] = self.temp_file.name
-        os.environ["DD_USERNAME"] = "test_user"
-
-    def tearDown(self) -> None:
-        """各テストの後に一時ファイルを削除し、環境変数を復元"""
-        Path(self.temp_file.name).unlink(missing_ok=True)
-        if self.original_data_path is not None:
-            os.environ["DD_DATA_PATH"] = self.original_data_path
-        elif "DD_DATA_PATH" in os.environ:
-            del os.environ["DD_DATA_PATH"]
-        if self.original_username is not None:
-            os.environ["DD_USERNAME"] = self.original_username
-        elif "DD_USERNAME" in os.environ:
-            del os.environ["DD_USERNAME"]
+        """前のテストが書いたデータを空にする (空ファイルは空のストアとして読み込まれる)"""
+        self.data_path.write_text("", encoding="utf-8")
 
     # ---- 一覧取得 / 個別取得 ----
 
@@ -64,11 +61,11 @@ class TestOps(unittest.TestCase):
         assert task1.id in archived_ids
 
         archived_tasks = ops.list_tasks(archived=True)
-        archived_task_ids = [t.id for t in archived_tasks]
+        archived_task_ids = {t.id for t in archived_tasks}
         assert task1.id in archived_task_ids
 
         active_tasks = ops.list_tasks(archived=False)
-        active_task_ids = [t.id for t in active_tasks]
+        active_task_ids = {t.id for t in active_tasks}
         assert task2.id in active_task_ids
         assert task1.id not in active_task_ids
 
@@ -84,9 +81,13 @@ class TestOps(unittest.TestCase):
 
     def test_list_tasks_with_topo_sort(self) -> None:
         """Topo ソートでタスクを取得できることを確認"""
-        task1 = ops.add_task([], "タスク1")
-        task2 = ops.add_task([task1.id], "タスク2")
-        task3 = ops.add_task([task2.id], "タスク3")
+        task1, task2, task3 = ops.add_tasks(
+            [
+                {"title": "タスク1", "overwrite_id_by": "t1"},
+                {"title": "タスク2", "overwrite_id_by": "t2", "parent_ids": ["t1"]},
+                {"title": "タスク3", "overwrite_id_by": "t3", "parent_ids": ["t2"]},
+            ],
+        )
 
         tasks = ops.list_tasks(topo=True)
         task_ids = [t.id for t in tasks]
@@ -103,7 +104,7 @@ class TestOps(unittest.TestCase):
         ops.set_status(parent.id, "reviewed")
         ops.set_status(child.id, "pending")
         ready = ops.list_tasks(ready_only=True)
-        ids = [t.id for t in ready]
+        ids = {t.id for t in ready}
         assert child.id in ids
         assert parent.id not in ids  # done なので ready フィルタでは pending 等のみ
 
@@ -114,7 +115,7 @@ class TestOps(unittest.TestCase):
         ops.set_status(parent.id, "pending")
         ops.set_status(child.id, "pending")
         bottleneck = ops.list_tasks(bottleneck_only=True)
-        ids = [t.id for t in bottleneck]
+        ids = {t.id for t in bottleneck}
         assert parent.id in ids
 
     def test_list_tasks_with_component_of(self) -> None:
@@ -123,9 +124,8 @@ class TestOps(unittest.TestCase):
         b = ops.add_task([a.id], "B")
         c = ops.add_task([], "C")
         tasks = ops.list_tasks(component_of=a.id)
-        ids = [t.id for t in tasks]
-        assert a.id in ids
-        assert b.id in ids
+        ids = {t.id for t in tasks}
+        assert {a.id, b.id} <= ids
         assert c.id not in ids
 
     def test_list_tasks_component_of_not_found_raises(self) -> None:
@@ -143,6 +143,17 @@ class TestOps(unittest.TestCase):
         assert retrieved.description == "説明"
         assert retrieved.priority == 3
 
+    def test_read_only_flow_does_not_rewrite_file(self) -> None:
+        """一覧取得のように読むだけの操作の後は、commit() / save() してもファイルを書き換えないことを確認"""
+        ops.add_task([], "タスク1")
+        st = get_store()
+        self.enterContext(mock.patch.object(ops, "get_store", return_value=st))
+        replace = self.enterContext(mock.patch.object(Path, "replace", autospec=True))
+        assert len(ops.list_tasks()) == 1
+        st.commit()
+        st.save()
+        replace.assert_not_called()
+
     def test_get_task_not_found(self) -> None:
         """存在しないタスクを取得しようとすると OpsError が発生することを確認"""
         with pytest.raises(ops.OpsError) as exec_info:
@@ -170,8 +181,7 @@ class TestOps(unittest.TestCase):
 
     def test_add_task_with_multiple_parents(self) -> None:
         """複数の親タスクを持つタスクを追加できることを確認"""
-        parent1 = ops.add_task([], "親1")
-        parent2 = ops.add_task([], "親2")
+        parent1, parent2 = ops.add_tasks([{"title": "親1"}, {"title": "親2"}])
         child = ops.add_task([parent1.id, parent2.id], "子タスク")
         assert parent1.id in child.depends_on
         assert parent2.id in child.depends_on
@@ -180,6 +190,25 @@ class TestOps(unittest.TestCase):
         assert child.id in parent1_updated.children
         assert child.id in parent2_updated.children
 
+    def test_add_tasks_bulk(self) -> None:
+        """add_tasks で複数タスクをまとめて追加できることを確認"""
+        added = ops.add_tasks(
+            [
+                {"title": "親", "overwrite_id_by": "bp", "priority": 2},
+                {"title": "子", "parent_ids": ["bp"], "tags": ["tag1"]},
+            ],
+        )
+        assert [t.title for t in added] == ["親", "子"]
+        assert ops.get_task("bp").priority == 2
+        assert ops.get_task("bp").children == [added[1].id]
+        assert ops.get_task(added[1].id).tags == ["tag1"]
+
+    def test_add_tasks_rolls_back_on_error(self) -> None:
+        """add_tasks の途中で失敗すると何も追加されないことを確認"""
+        with pytest.raises(ops.OpsError):
+            ops.add_tasks([{"title": "A"}, {"title": "B", "parent_ids": ["nonexistent"]}])
+        assert ops.list_tasks() == []
+
     def test_add_task_with_overwrite_id(self) -> None:
         """overwrite_id_by で ID を指定できることを確認"""
         task = ops.add_task([], "タスク", overwrite_id_by="custom_id")
@@ -360,6 +389,26 @@ class TestOps(unittest.TestCase):
         assert task2_archived.is_archived is True
         assert task3_archived.is_archived is True
 
+    def test_archive_trees_dedupes_components(self) -> None:
+        """複数の起点を指定しても、同じ成分のタスクは1回だけ返ることを確認"""
+        task1 = ops.add_task([], "タスク1")
+        task2 = ops.add_task([task1.id], "タスク2")
+        task3 = ops.add_task([], "タスク3")
+        task4 = ops.add_task([], "タスク4")
+
+        archived_ids = ops.archive_trees([task1.id, task2.id, task3.id])
+        assert sorted(archived_ids) == sorted([task1.id, task2.id, task3.id])
+        assert ops.get_task(task2.id).is_archived is True
+        assert ops.get_task(task3.id).is_archived is True
+        assert ops.get_task(task4.id).is_archived is False
+
+    def test_archive_trees_not_found_rolls_back(self) -> None:
+        """いずれかの起点が存在しない場合は何もアーカイブされないことを確認"""
+        task1 = ops.add_task([], "タスク1")
+        with pytest.raises(ops.OpsError):
+            ops.archive_trees([task1.id, "nonexistent"])
+        assert ops.get_task(task1.id).is_archived is False
+
     def test_archive_tree_not_found(self) -> None:
         """存在しないタスクをアーカイブしようとすると OpsError が発生することを確認"""
         with pytest.raises(ops.OpsError) as exec_info:
@@ -391,8 +440,7 @@ class TestOps(unittest.TestCase):
 
     def test_get_deps(self) -> None:
         """タスクの依存関係を取得できることを確認"""
-        parent1 = ops.add_task([], "親1")
-        parent2 = ops.add_task([], "親2")
+        parent1, parent2 = ops.add_tasks([{"title": "親1"}, {"title": "親2"}])
         child = ops.add_task([parent1.id, parent2.id], "子")
 
         deps = ops.get_deps(child.id)
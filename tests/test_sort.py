@@ -22,36 +22,49 @@ def _task(
     )
 
 
+# ソートは Task を書き換えないので、フィクスチャはモジュールで1回だけ作って使い回す
+_NO_START = _task("a", start_at=None)
+_SIMPLE_DAG = {
+    "a": _task("a", children=["b"]),
+    "b": _task("b", children=["c"]),
+    "c": _task("c"),
+}
+_PARTIAL_DAG = {
+    "a": _task("a", children=["b", "x"]),
+    "b": _task("b"),
+}
+_CYCLIC_DAG = {
+    "a": _task("a", children=["b"]),
+    "b": _task("b", children=["a"]),
+}
+
+
 class TestTaskSortKey(unittest.TestCase):
     def test_order_now_uses_now_iso_when_start_at_none(self) -> None:
-        t = _task("a", start_at=None)
+        t = _NO_START
         key = task_sort_key(t, order_with_no_start="now")
         assert key[1] != "9999-12-31T23:59:59"
         assert len(key[1]) == 19  # ISO format length
 
+    def test_order_now_uses_given_now(self) -> None:
+        t = _NO_START
+        key = task_sort_key(t, order_with_no_start="now", now="2024-06-01T12:00:00")
+        assert key[1] == "2024-06-01T12:00:00"
+
     def test_order_end_of_time(self) -> None:
-        t = _task("a", start_at=None)
+        t = _NO_START
         key = task_sort_key(t, order_with_no_start="end_of_time")
         assert key[1] == "9999-12-31T23:59:59"
 
 
 class TestTopoSort(unittest.TestCase):
     def test_simple_dag(self) -> None:
-        tasks = {
-            "a": _task("a", children=["b"]),
-            "b": _task("b", children=["c"]),
-            "c": _task("c"),
-        }
-        result = topo_sort(tasks)
+        result = topo_sort(_SIMPLE_DAG)
         ids = [t.id for t in result]
         assert ids.index("a") < ids.index("b") < ids.index("c")
 
     def test_partial_graph_skips_external_children(self) -> None:
-        tasks = {
-            "a": _task("a", children=["b", "x"]),
-            "b": _task("b"),
-        }
-        result = topo_sort(tasks)
+        result = topo_sort(_PARTIAL_DAG)
         assert len(result) == 2
         ids = [t.id for t in result]
         assert ids.index("a") < ids.index("b")
@@ -59,11 +72,7 @@ class TestTopoSort(unittest.TestCase):
     def test_remaining_nodes_appended(self) -> None:
         # Cycle: a->b->a. Indegrees never become 0 for both, so result stays empty
         # then len(result) < len(tasks) path is taken
-        tasks = {
-            "a": _task("a", children=["b"]),
-            "b": _task("b", children=["a"]),
-        }
-        result = topo_sort(tasks)
+        result = topo_sort(_CYCLIC_DAG)
         assert len(result) == 2
         in_result = {t.id for t in result}
         assert in_result == {"a", "b"}
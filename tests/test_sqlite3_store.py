@@ -2,6 +2,9 @@ import os
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
+
+import pytest
 
 from dandori.core.models import Task
 from dandori.storage.sqlite3_store import StoreToSQLite
@@ -10,20 +13,26 @@ from dandori.storage.sqlite3_store import StoreToSQLite
 class TestSQLite3Store(unittest.TestCase):
     """StoreToSQLite の単体メソッド・エラー経路のテスト"""
 
+    store: StoreToSQLite
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.enterClassContext(mock.patch.dict(os.environ, {"DD_USERNAME": "test_user"}))
+        # ここではファイルの永続性は見ないので、インメモリ DB をクラスで 1 つだけ作って使い回す
+        cls.store = StoreToSQLite(data_path=":memory:")
+        cls.store.load()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.store.conn.close()
+
     def setUp(self) -> None:
-        self.original_username = os.environ.get("DD_USERNAME")
-        os.environ["DD_USERNAME"] = "test_user"
-        self.temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".db")  # noqa: SIM115
-        self.temp_file.close()
-        self.store = StoreToSQLite(data_path=self.temp_file.name)
-        self.store.load()
-
-    def tearDown(self) -> None:
-        Path(self.temp_file.name).unlink(missing_ok=True)
-        if self.original_username is not None:
-            os.environ["DD_USERNAME"] = self.original_username
-        elif "DD_USERNAME" in os.environ:
-            del os.environ["DD_USERNAME"]
+        """前のテストの未コミット分を捨て、テーブルを空にする"""
+        c = self.store.conn
+        c.rollback()
+        c.execute("DELETE FROM edges")
+        c.execute("DELETE FROM tasks")
+        c.commit()
 
     def test_add_task_duplicate_err(self) -> None:
         t = Task(id="dup", title="T", owner="test_user")
@@ -37,9 +46,9 @@ class TestSQLite3Store(unittest.TestCase):
         """add_task に depends_on 付きのタスクを渡すと edges に反映される (import/マイグレと YAML 同様)."""
         parent = Task(id="pa", title="Parent", owner="test_user")
         child = Task(id="ch", title="Child", owner="test_user", depends_on=["pa"])
-        self.store.add_task(parent)
-        self.store.add_task(child)
-        self.store.commit()
+        with self.store.transaction():
+            self.store.add_task(parent)
+            self.store.add_task(child)
         ra = self.store.get_task("pa")
         rb = self.store.get_task("ch")
         assert ra.is_ok()
@@ -47,6 +56,73 @@ class TestSQLite3Store(unittest.TestCase):
         assert ra.unwrap().children == ["ch"]
         assert rb.unwrap().depends_on == ["pa"]
 
+    def test_connection_uses_wal(self) -> None:
+        # WAL モードで作られる補助ファイルもディレクトリごと削除する
+        tmp_dir = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        store = StoreToSQLite(data_path=str(tmp_dir / "wal.db"))
+        try:
+            mode = store.conn.execute("PRAGMA journal_mode").fetchone()[0]
+            assert mode.lower() == "wal"
+        finally:
+            store.conn.close()
+
+    def test_memory_store_skips_wal(self) -> None:
+        mode = self.store.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode.lower() == "memory"
+
+    def test_add_task_with_depends_on_skips_missing_and_duplicates(self) -> None:
+        p1 = Task(id="p1", title="P1", owner="test_user")
+        p2 = Task(id="p2", title="P2", owner="test_user")
+        child = Task(id="cx", title="Child", owner="test_user", depends_on=["p2", "missing", "p1", "p2"])
+        self.store.add_task(p1)
+        self.store.add_task(p2)
+        assert self.store.add_task(child).is_ok()
+        self.store.commit()
+        assert sorted(self.store.get_task("cx").unwrap().depends_on) == ["p1", "p2"]
+        assert self.store.get_task("p1").unwrap().children == ["cx"]
+        assert self.store.get_task("p2").unwrap().children == ["cx"]
+
+    def _add_in_failing_transaction(self, tid: str) -> None:
+        """transaction() の中でタスクを追加してから例外を送出する"""
+        with self.store.transaction():
+            self.store.add_task(Task(id=tid, title=tid, owner="test_user"))
+            raise RuntimeError
+
+    def test_transaction_rolls_back_on_error(self) -> None:
+        with pytest.raises(RuntimeError):
+            self._add_in_failing_transaction("tx")
+        assert self.store.get_task("tx").is_err()
+        assert not self.store.conn.in_transaction
+
+    def test_nested_transaction_failure_keeps_outer_writes(self) -> None:
+        """内側のブロックが失敗しても、呼び出し元の未コミットの書き込みは残る"""
+        self.store.add_task(Task(id="outer", title="O", owner="test_user"))
+        with pytest.raises(RuntimeError):
+            self._add_in_failing_transaction("inner")
+        assert self.store.get_task("outer").is_ok()
+        assert self.store.get_task("inner").is_err()
+        assert self.store.conn.in_transaction
+
+    def test_nested_transaction_does_not_commit_outer_writes(self) -> None:
+        """内側のブロックが成功しても commit はせず、呼び出し元の rollback で両方とも取り消せる"""
+        self.store.add_task(Task(id="outer", title="O", owner="test_user"))
+        with self.store.transaction():
+            self.store.add_task(Task(id="inner", title="I", owner="test_user"))
+        assert self.store.conn.in_transaction
+        self.store.rollback()
+        assert self.store.get_task("outer").is_err()
+        assert self.store.get_task("inner").is_err()
+
+    def test_transaction_inside_transaction_commits_once_at_the_end(self) -> None:
+        with self.store.transaction():
+            self.store.add_task(Task(id="a", title="A", owner="test_user"))
+            with self.store.transaction():
+                self.store.add_task(Task(id="b", title="B", owner="test_user"))
+            inner_left_open = self.store.conn.in_transaction
+        assert inner_left_open
+        assert not self.store.conn.in_transaction
+        assert self.store.get_task("b").is_ok()
+
     def test_get_task_not_found_err(self) -> None:
         r = self.store.get_task("nonexistent")
         assert r.is_err()
@@ -71,10 +147,10 @@ class TestSQLite3Store(unittest.TestCase):
     def test_link_unlink_tasks(self) -> None:
         a = Task(id="la", title="A", owner="test_user")
         b = Task(id="lb", title="B", owner="test_user")
-        self.store.add_task(a)
-        self.store.add_task(b)
-        self.store.commit()
-        r = self.store.link_tasks("la", "lb")
+        with self.store.transaction():
+            self.store.add_task(a)
+            self.store.add_task(b)
+            r = self.store.link_tasks("la", "lb")
         assert r.is_ok()
         ra = self.store.get_task("la")
         rb = self.store.get_task("lb")
@@ -91,11 +167,10 @@ class TestSQLite3Store(unittest.TestCase):
         a = Task(id="ia", title="A", owner="test_user")
         b = Task(id="ib", title="B", owner="test_user")
         mid = Task(id="imid", title="Mid", owner="test_user")
-        self.store.add_task(a)
-        self.store.add_task(b)
-        self.store.commit()
-        self.store.link_tasks("ia", "ib")
-        self.store.commit()
+        with self.store.transaction():
+            self.store.add_task(a)
+            self.store.add_task(b)
+            self.store.link_tasks("ia", "ib")
         r = self.store.insert_task("ia", "ib", mid)
         assert r.is_ok()
         ra = self.store.get_task("ia")
@@ -106,40 +181,36 @@ class TestSQLite3Store(unittest.TestCase):
         assert rmid.unwrap().children == ["ib"]
         assert rb.unwrap().depends_on == ["imid"]
 
-    def test_get_dependency_info(self) -> None:
-        a = Task(id="da", title="A", owner="test_user")
-        b = Task(id="db", title="B", owner="test_user")
+    def test_request_cache_invalidated_by_link(self) -> None:
+        a = Task(id="qa", title="A", owner="test_user")
+        b = Task(id="qb", title="B", owner="test_user")
         self.store.add_task(a)
         self.store.add_task(b)
         self.store.commit()
-        self.store.link_tasks("da", "db")
+        with self.store._request_cache():  # noqa: SLF001
+            first = self.store.get_task("qa").unwrap()
+            assert self.store.get_task("qa").unwrap() is first
+            self.store.link_tasks("qa", "qb")
+            assert self.store.get_task("qa").unwrap().children == ["qb"]
+        assert self.store.get_task("qa").unwrap() is not first
+
+    def test_request_cache_is_per_store(self) -> None:
+        """別のストアのキャッシュ中でも、同じ ID の Task は自分の DB から読む"""
+        self.store.add_task(Task(id="same", title="mine", owner="test_user"))
         self.store.commit()
-        r = self.store.get_dependency_info("da")
-        assert r.is_ok()
-        info = r.unwrap()
-        assert "depends_on" in info
-        assert "children" in info
-        assert "B" in info["children"]
+        other = StoreToSQLite(data_path=":memory:")
+        other.load()
+        self.addCleanup(other.conn.close)
+        other.add_task(Task(id="same", title="other", owner="test_user"))
+        other.commit()
+        with self.store._request_cache(), other._request_cache():  # noqa: SLF001
+            assert self.store.get_task("same").unwrap().title == "mine"
+            assert other.get_task("same").unwrap().title == "other"
 
     def test_weakly_connected_component_not_found_err(self) -> None:
         r = self.store.weakly_connected_component("nonexistent")
         assert r.is_err()
 
-    def test_weakly_connected_component_ok(self) -> None:
-        a = Task(id="wa", title="A", owner="test_user")
-        b = Task(id="wb", title="B", owner="test_user")
-        self.store.add_task(a)
-        self.store.add_task(b)
-        self.store.commit()
-        self.store.link_tasks("wa", "wb")
-        self.store.commit()
-        r = self.store.weakly_connected_component("wa")
-        assert r.is_ok()
-        comp = r.unwrap()
-        assert len(comp) == 2
-        ids = {t.id for t in comp}
-        assert ids == {"wa", "wb"}
-
     def test_archive_unarchive_tasks(self) -> None:
         a = Task(id="ar", title="A", owner="test_user")
         self.store.add_task(a)
@@ -153,6 +224,28 @@ class TestSQLite3Store(unittest.TestCase):
         ra2 = self.store.get_task("ar")
         assert not ra2.unwrap().is_archived
 
+    def test_archive_tasks_whole_component(self) -> None:
+        a = Task(id="ca", title="A", owner="test_user")
+        b = Task(id="cb", title="B", owner="test_user")
+        c = Task(id="cc", title="C", owner="test_user")
+        other = Task(id="co", title="Other", owner="test_user")
+        for t in (a, b, c, other):
+            self.store.add_task(t)
+        self.store.commit()
+        self.store.link_tasks("ca", "cb")
+        self.store.link_tasks("cc", "cb")
+        self.store.commit()
+        r = self.store.archive_tasks("ca")
+        assert r.is_ok()
+        assert set(r.unwrap()) == {"ca", "cb", "cc"}
+        assert self.store.get_task("cc").unwrap().is_archived
+        assert not self.store.get_task("co").unwrap().is_archived
+
+    def test_archive_tasks_not_found_err(self) -> None:
+        r = self.store.archive_tasks("nonexistent")
+        assert r.is_err()
+        assert "not found" in r.unwrap_err().lower()
+
     def test_remove_task(self) -> None:
         t = Task(id="rm", title="T", owner="test_user")
         self.store.add_task(t)
@@ -163,5 +256,42 @@ class TestSQLite3Store(unittest.TestCase):
         assert r2.is_err()
 
 
+class TestSQLite3StoreLinkedPair(unittest.TestCase):
+    """A→B の 2 タスクだけのグラフを読むだけのテスト (グラフはクラスで 1 回だけ作る)"""
+
+    store: StoreToSQLite
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.enterClassContext(mock.patch.dict(os.environ, {"DD_USERNAME": "test_user"}))
+        cls.store = StoreToSQLite(data_path=":memory:")
+        cls.store.load()
+        with cls.store.transaction():
+            cls.store.add_task(Task(id="wa", title="A", owner="test_user"))
+            cls.store.add_task(Task(id="wb", title="B", owner="test_user"))
+            cls.store.link_tasks("wa", "wb")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.store.conn.close()
+
+    def test_link_is_visible_from_both_sides(self) -> None:
+        assert self.store.get_task("wa").unwrap().children == ["wb"]
+        assert self.store.get_task("wb").unwrap().depends_on == ["wa"]
+
+    def test_get_dependency_info(self) -> None:
+        r = self.store.get_dependency_info("wa")
+        assert r.is_ok()
+        info = r.unwrap()
+        assert "depends_on" in info
+        assert "children" in info
+        assert "B" in info["children"]
+
+    def test_weakly_connected_component_ok(self) -> None:
+        r = self.store.weakly_connected_component("wa")
+        assert r.is_ok()
+        assert {t.id for t in r.unwrap()} == {"wa", "wb"}
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,6 @@
 import io
-import sys
 import unittest
+from contextlib import redirect_stdout
 
 from dandori.core.models import Task
 from dandori.io.std_io import print_task
@@ -21,41 +21,39 @@ def _task(
     )
 
 
+_REQUIRED_FIELDS = (
+    "status:",
+    "priority:",
+    "archived:",
+    "due:",
+    "start:",
+    "depends_on:",
+    "children:",
+    "created_at:",
+    "updated_at:",
+)
+_OPTIONAL_FIELDS = ("assigned_to:", "requested_by:", "tags:")
+
+
+def _capture(t: Task) -> str:
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        print_task(t)
+    return buf.getvalue()
+
+
 class TestPrintTask(unittest.TestCase):
     def test_prints_required_fields(self) -> None:
         t = _task()
-        buf = io.StringIO()
-
-        old = sys.stdout
-        sys.stdout = buf
-        try:
-            print_task(t)
-        finally:
-            sys.stdout = old
-        out = buf.getvalue()
+        out = _capture(t)
         assert "id: tid" in out
         assert "title: title" in out
-        assert "status:" in out
-        assert "priority:" in out
-        assert "archived:" in out
-        assert "due:" in out
-        assert "start:" in out
-        assert "depends_on:" in out
-        assert "children:" in out
-        assert "created_at:" in out
-        assert "updated_at:" in out
+        missing = [f for f in _REQUIRED_FIELDS if f not in out]
+        assert not missing
 
     def test_prints_optional_when_set(self) -> None:
         t = _task(assigned_to="a", requested_by="r", tags=["x"])
-        buf = io.StringIO()
-
-        old = sys.stdout
-        sys.stdout = buf
-        try:
-            print_task(t)
-        finally:
-            sys.stdout = old
-        out = buf.getvalue()
+        out = _capture(t)
         assert "assigned_to: a" in out
         assert "requested_by: r" in out
         assert "tags:" in out
@@ -63,18 +61,7 @@ class TestPrintTask(unittest.TestCase):
 
     def test_omits_optional_when_empty(self) -> None:
         t = _task(assigned_to=None, requested_by=None, tags=[])
-        buf = io.StringIO()
-
-        old = sys.stdout
-        sys.stdout = buf
-        try:
-            print_task(t)
-        finally:
-            sys.stdout = old
-        out = buf.getvalue()
-        assert "assigned_to:" not in out
-        assert "requested_by:" not in out
-        assert "assigned_to:" not in out
-        assert "requested_by:" not in out
+        out = _capture(t)
         # tags line is omitted when empty (if t.tags is falsy)
-        assert out.count("tags:") == 0
+        present = [f for f in _OPTIONAL_FIELDS if f in out]
+        assert not present
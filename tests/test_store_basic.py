@@ -2,6 +2,7 @@ import os
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 from dandori.core.models import Task
 from dandori.storage.yaml_store import StoreToYAML
@@ -10,22 +11,22 @@ from dandori.storage.yaml_store import StoreToYAML
 class TestStoreBasic(unittest.TestCase):
     """基本的なStore操作のテスト: add → list → show の一連の流れ"""
 
+    data_path: str
+    store: StoreToYAML
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """一時ディレクトリとストアはクラスで1つだけ作り、ディレクトリは最後にまとめて削除する"""
+        cls.enterClassContext(mock.patch.dict(os.environ, {"DD_USERNAME": "test_user"}))
+        tmp_dir = Path(cls.enterClassContext(tempfile.TemporaryDirectory()))
+        cls.data_path = str(tmp_dir / "tasks.yaml")
+        cls.store = StoreToYAML(data_path=cls.data_path)
+        cls.store.load()
+
     def setUp(self) -> None:
-        """各テストの前に一時ファイルを作成"""
-        self.original_username = os.environ.get("DD_USERNAME")
-        os.environ["DD_USERNAME"] = "test_user"
-        self.temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".yaml")  # noqa: SIM115
-        self.temp_file.close()
-        self.store = StoreToYAML(data_path=self.temp_file.name)
-        self.store.load()
-
-    def tearDown(self) -> None:
-        """各テストの後に一時ファイルを削除"""
-        Path(self.temp_file.name).unlink(missing_ok=True)
-        if self.original_username is not None:
-            os.environ["DD_USERNAME"] = self.original_username
-        elif "DD_USERNAME" in os.environ:
-            del os.environ["DD_USERNAME"]
+        """前のテストが残したタスクを捨て、空のストアから始める"""
+        self.store.tasks = {}
+        self.store.commit()
 
     def test_add_list_show_flow(self) -> None:
         """Add → list → show の一連の流れをテスト"""
@@ -74,6 +75,87 @@ class TestStoreBasic(unittest.TestCase):
         assert result.is_err()
         assert "not found" in result.unwrap_err()
 
+    def test_add_tasks_adds_all_with_links(self) -> None:
+        """add_tasks でまとめて追加したタスクの親子関係がインデックスにも反映される"""
+        parent = Task(id="p", title="親", owner="test_user", children=["c"])
+        child = Task(id="c", title="子", owner="test_user", depends_on=["p"])
+        assert self.store.add_tasks([parent, child]).is_ok()
+        comp = self.store.weakly_connected_component("p").unwrap()
+        assert {t.id for t in comp} == {"p", "c"}
+        assert self.store.unlink_tasks("p", "c").is_ok()
+        assert self.store.get_task("c").unwrap().depends_on == []
+
+    def test_add_tasks_is_all_or_nothing_on_duplicate(self) -> None:
+        """add_tasks は ID が1件でも重複していれば何も追加しない"""
+        self.store.add_task(Task(id="dup", title="既存", owner="test_user"))
+        new = Task(id="new", title="新規", owner="test_user")
+        again = Task(id="dup", title="重複", owner="test_user")
+        result = self.store.add_tasks([new, again])
+        assert result.is_err()
+        assert "already exists" in result.unwrap_err()
+        assert self.store.get_task("new").is_err()
+        assert self.store.get_task("dup").unwrap().title == "既存"
+
+    def test_unlink_drops_duplicated_edges(self) -> None:
+        """リストに重複して入っているエッジも unlink でまとめて削除される"""
+        parent = Task(id="p", title="親", owner="test_user", children=["c", "c"])
+        child = Task(id="c", title="子", owner="test_user", depends_on=["p", "p"])
+        self.store.add_task(parent)
+        self.store.add_task(child)
+        assert self.store.unlink_tasks("p", "c").is_ok()
+        assert self.store.get_task("p").unwrap().children == []
+        assert self.store.get_task("c").unwrap().depends_on == []
+
+    def test_remove_task_detaches_all_neighbors(self) -> None:
+        """remove_task で親・子すべてから削除対象へのエッジが消える"""
+        for tid in ("a1", "a2", "mid", "b1", "b2"):
+            self.store.add_task(Task(id=tid, title=tid, owner="test_user"))
+        for pid in ("a1", "a2"):
+            self.store.link_tasks(pid, "mid")
+        for cid in ("b1", "b2"):
+            self.store.link_tasks("mid", cid)
+        assert self.store.remove_task("mid").is_ok()
+        assert self.store.get_task("mid").is_err()
+        for tid in ("a1", "a2"):
+            assert self.store.get_task(tid).unwrap().children == []
+        for tid in ("b1", "b2"):
+            assert self.store.get_task(tid).unwrap().depends_on == []
+        # 削除後の ID で再追加・再リンクしても古いエッジが残っていない
+        self.store.add_task(Task(id="mid", title="mid", owner="test_user"))
+        comp = self.store.weakly_connected_component("mid").unwrap()
+        assert [t.id for t in comp] == ["mid"]
+
+    def test_link_tasks_added_through_tasks_dict(self) -> None:
+        """辞書 tasks へ直接入れたタスクも link / unlink / remove できる"""
+        self.store.tasks["p"] = Task(id="p", title="親", owner="test_user")
+        self.store.tasks["c"] = Task(id="c", title="子", owner="test_user")
+        assert self.store.link_tasks("p", "c").is_ok()
+        assert self.store.get_task("c").unwrap().depends_on == ["p"]
+        assert self.store.unlink_tasks("p", "c").is_ok()
+        assert self.store.get_task("p").unwrap().children == []
+        assert self.store.remove_task("c").is_ok()
+
+    def test_wcc_sees_lists_edited_in_place(self) -> None:
+        """リスト children / depends_on を直接書き換えた後も弱連結成分は古いキャッシュを返さない"""
+        self.store.add_task(Task(id="p", title="親", owner="test_user"))
+        self.store.add_task(Task(id="c", title="子", owner="test_user"))
+        assert [t.id for t in self.store.weakly_connected_component("p").unwrap()] == ["p"]
+        self.store.tasks["p"].children.append("c")
+        self.store.tasks["c"].depends_on.append("p")
+        comp = self.store.weakly_connected_component("p").unwrap()
+        assert {t.id for t in comp} == {"p", "c"}
+
+    def test_link_detects_cycle_after_edit_through_get_task(self) -> None:
+        """get_task で受け取った Task のリストを直接書き換えた後も、弱連結成分と循環検出に反映される"""
+        self.store.add_task(Task(id="p", title="親", owner="test_user"))
+        self.store.add_task(Task(id="c", title="子", owner="test_user"))
+        assert [t.id for t in self.store.weakly_connected_component("p").unwrap()] == ["p"]
+        self.store.get_task("p").unwrap().children.append("c")
+        self.store.get_tasks(["c"]).unwrap()[0].depends_on.append("p")
+        comp = self.store.weakly_connected_component("p").unwrap()
+        assert {t.id for t in comp} == {"p", "c"}
+        assert self.store.link_tasks("c", "p").unwrap_err() == "Cycle detected: c -> p"
+
 
 if __name__ == "__main__":
     unittest.main()
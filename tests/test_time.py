@@ -3,10 +3,11 @@ import unittest
 from datetime import datetime, timedelta, timezone
 
 from dandori.core.models import Task
-from dandori.util.time import format_requested_sla, now_iso
+from dandori.util.time import format_requested_sla, now_iso, parse_jst
 
 JST = timezone(timedelta(hours=9))
 ISO_FMT = "%Y-%m-%dT%H:%M:%S"
+_ISO_RE = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}")
 
 
 def _task(
@@ -26,10 +27,36 @@ class TestNowIso(unittest.TestCase):
     def test_format(self) -> None:
         out = now_iso()
         # YYYY-MM-DDTHH:MM:SS
-        assert re.match(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}", out)
+        assert _ISO_RE.match(out)
+
+
+class TestParseJst(unittest.TestCase):
+    def test_naive_is_jst(self) -> None:
+        dt = parse_jst("2025-01-10T12:00:00")
+        assert dt.utcoffset() == timedelta(hours=9)
+        assert dt.hour == 12
+
+    def test_roundtrip_with_now_iso(self) -> None:
+        """now_iso() の出力 (JST, オフセットなし) が変換なしで同じ時刻として読める"""
+        before = datetime.now(JST).replace(microsecond=0)
+        dt = parse_jst(now_iso())
+        after = datetime.now(JST)
+        assert before <= dt <= after
+
+    def test_aware_is_converted(self) -> None:
+        dt = parse_jst("2025-01-10T03:00:00+00:00")
+        assert dt.utcoffset() == timedelta(hours=9)
+        assert dt.hour == 12
 
 
 class TestFormatRequestedSla(unittest.TestCase):
+    now: datetime
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """相対時刻の基準はクラスで1回だけ取る"""
+        cls.now = datetime.now(JST)
+
     def test_no_requested_at(self) -> None:
         t = _task(requested_at=None)
         r = format_requested_sla(t)
@@ -37,7 +64,7 @@ class TestFormatRequestedSla(unittest.TestCase):
         assert r.unwrap() == ""
 
     def test_requested_at_only(self) -> None:
-        past = (datetime.now(JST) - timedelta(days=1, hours=2)).strftime(ISO_FMT)
+        past = (self.now - timedelta(days=1, hours=2)).strftime(ISO_FMT)
         t = _task(requested_at=past)
         r = format_requested_sla(t)
         assert r.is_ok()
@@ -47,14 +74,29 @@ class TestFormatRequestedSla(unittest.TestCase):
         assert "h" in s
 
     def test_with_due_date(self) -> None:
-        past = (datetime.now(JST) - timedelta(days=1)).strftime(ISO_FMT)
-        future = (datetime.now(JST) + timedelta(days=2, hours=3)).strftime(ISO_FMT)
+        past = (self.now - timedelta(days=1)).strftime(ISO_FMT)
+        future = (self.now + timedelta(days=2, hours=3)).strftime(ISO_FMT)
         t = _task(requested_at=past, due_date=future)
         r = format_requested_sla(t)
         assert r.is_ok()
         s = r.unwrap()
         assert " / SLA:" in s
 
+    def test_uses_given_now(self) -> None:
+        past = (self.now - timedelta(days=1)).strftime(ISO_FMT)
+        t = _task(requested_at=past)
+        now = self.now + timedelta(days=10)
+        first = format_requested_sla(t, now=now).unwrap()
+        later = format_requested_sla(t, now=now + timedelta(days=1)).unwrap()
+        assert int(later[1:].split("d")[0]) == int(first[1:].split("d")[0]) + 1
+
+    def test_exact_with_given_now(self) -> None:
+        now = datetime(2025, 1, 10, 12, 0, 0, tzinfo=JST)
+        req = (now - timedelta(days=2, hours=5)).strftime(ISO_FMT)
+        due = (now + timedelta(days=1, hours=3)).strftime(ISO_FMT)
+        t = _task(requested_at=req, due_date=due)
+        assert format_requested_sla(t, now=now).unwrap() == "+2d5h / SLA:1d3h"
+
     def test_parse_error_requested_at(self) -> None:
         t = _task(requested_at="not-a-date")
         r = format_requested_sla(t)
@@ -62,7 +104,7 @@ class TestFormatRequestedSla(unittest.TestCase):
         assert "???" in r.unwrap_err()
 
     def test_parse_error_due_date(self) -> None:
-        past = (datetime.now(JST) - timedelta(days=1)).strftime(ISO_FMT)
+        past = (self.now - timedelta(days=1)).strftime(ISO_FMT)
         t = _task(requested_at=past, due_date="invalid")
         r = format_requested_sla(t)
         assert r.is_err()
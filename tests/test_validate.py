@@ -14,50 +14,53 @@ def _task(tid: str, children: list[str] | None = None, depends_on: list[str] | N
     )
 
 
+# detect_cycles は Task を書き換えないので、グラフはモジュールで1回だけ作って使い回す
+_NO_CYCLE = {
+    "a": _task("a", children=["b"]),
+    "b": _task("b", children=["c"], depends_on=["a"]),
+    "c": _task("c", depends_on=["b"]),
+}
+_DIRECT_CYCLE = {
+    "a": _task("a", children=["a"], depends_on=["a"]),
+}
+_SIMPLE_CYCLE = {
+    "a": _task("a", children=["b"], depends_on=[]),
+    "b": _task("b", children=["a"], depends_on=["a"]),
+}
+_LONG_CYCLE = {
+    "a": _task("a", children=["b"]),
+    "b": _task("b", children=["c"], depends_on=["a"]),
+    "c": _task("c", children=["a"], depends_on=["b"]),
+}
+_MULTIPLE_CYCLES = {
+    "a": _task("a", children=["b"]),
+    "b": _task("b", children=["a"], depends_on=["a"]),
+    "c": _task("c", children=["c"]),
+}
+
+
 class TestDetectCycles(unittest.TestCase):
     def test_no_cycle(self) -> None:
-        tasks = {
-            "a": _task("a", children=["b"]),
-            "b": _task("b", children=["c"], depends_on=["a"]),
-            "c": _task("c", depends_on=["b"]),
-        }
-        assert detect_cycles(tasks) == []
+        assert detect_cycles(_NO_CYCLE) == []
 
     def test_direct_cycle(self) -> None:
-        tasks = {
-            "a": _task("a", children=["a"], depends_on=["a"]),
-        }
-        cycles = detect_cycles(tasks)
+        cycles = detect_cycles(_DIRECT_CYCLE)
         assert len(cycles) == 1
         assert cycles[0] == ["a", "a"]
 
     def test_simple_cycle(self) -> None:
-        tasks = {
-            "a": _task("a", children=["b"], depends_on=[]),
-            "b": _task("b", children=["a"], depends_on=["a"]),
-        }
-        cycles = detect_cycles(tasks)
+        cycles = detect_cycles(_SIMPLE_CYCLE)
         assert len(cycles) == 1
         assert set(cycles[0]) == {"a", "b"}
         assert cycles[0][0] == cycles[0][-1]
 
     def test_long_cycle(self) -> None:
-        tasks = {
-            "a": _task("a", children=["b"]),
-            "b": _task("b", children=["c"], depends_on=["a"]),
-            "c": _task("c", children=["a"], depends_on=["b"]),
-        }
-        cycles = detect_cycles(tasks)
+        cycles = detect_cycles(_LONG_CYCLE)
         assert len(cycles) == 1
         assert len(cycles[0]) == 4  # a, b, c, a
 
     def test_multiple_cycles(self) -> None:
-        tasks = {
-            "a": _task("a", children=["b"]),
-            "b": _task("b", children=["a"], depends_on=["a"]),
-            "c": _task("c", children=["c"]),
-        }
-        cycles = detect_cycles(tasks)
+        cycles = detect_cycles(_MULTIPLE_CYCLES)
         assert len(cycles) >= 1
 
 